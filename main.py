@@ -1,7 +1,6 @@
 import os
 import sys
 import argparse
-from src.pipeline import Pipeline
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -9,10 +8,14 @@ logger = setup_logger()
 
 def parse_args():
     parser = argparse.ArgumentParser(description='ETL Pipeline')
-    parser.add_argument('--mode', required=True, choices=['csv', 'json'], help='Processing mode: csv or json')
+    parser.add_argument('--mode', required=True, choices=['csv', 'json', 'worker'], help='Processing mode: csv, json or worker')
     parser.add_argument('--store-key', help='Object store key')
-    parser.add_argument('--db-type', help='Destination database type (e.g., postgresql, sqlite)', default='postgresql')
+    parser.add_argument('--db-type', help='Destination database type: postgresql, sqlite or duckdb (default: DB_TYPE, else postgresql)')
     parser.add_argument('--file', help='Input file path (CSV or JSON based on mode)')
+    parser.add_argument('--store-only', action='store_true', help='Write to the object store only; skip the database load')
+    parser.add_argument('--load-strategy', choices=['full', 'incremental'], help='Reload whole tables or apply only the latest changes')
+    parser.add_argument('--profile', action='store_true', help='Write cProfile, tracemalloc and collapsed-stack output per stage to the log directory')
+    parser.add_argument('--spool-dir', help='Job spool directory for worker mode', default=os.getenv('SPOOL_DIR', './spool'))
     return parser.parse_args()
 
 
@@ -26,6 +29,17 @@ def main():
     if args.db_type:
         os.environ['DB_TYPE'] = args.db_type
     
+    if args.load_strategy:
+        os.environ['LOAD_STRATEGY'] = args.load_strategy
+    
+    if args.profile:
+        os.environ['PIPELINE_PROFILE'] = '1'
+    
+    if args.mode == 'worker':
+        from src.worker import Worker
+        Worker(args.spool_dir).run()
+        return
+    
     # Get file path from args or ENV
     if args.file:
         file_path = args.file
@@ -39,13 +53,17 @@ def main():
     if not file_path:
         raise ValueError(f"File path must be provided via --file argument or {args.mode.upper()}_FILE environment variable")
     
+    # Imported after argument validation so bad invocations exit without loading polars
+    from src.pipeline import Pipeline
+    
     pipeline = Pipeline()
+    load = not args.store_only
     
     try:
         if args.mode == 'csv':
-            pipeline.process_csv(file_path)
+            pipeline.process_csv(file_path, load=load)
         elif args.mode == 'json':
-            pipeline.process_json(file_path)
+            pipeline.process_json(file_path, load=load)
         
         logger.info("Pipeline completed successfully")
     except ConnectionError as e:
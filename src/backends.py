@@ -0,0 +1,487 @@
+import io
+import time
+from abc import ABC, abstractmethod
+import polars as pl
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+from .governor import MemoryGovernor
+
+AUTO_ID = 'AUTO_ID'
+PARQUET_BATCH_SIZE = 65536
+# COPY uses \N for NULL
+COPY_NULL = '\\N'
+STAGING_TABLE = 'etl_staging'
+
+# Shared table definitions rendered into each backend's DDL. AUTO_ID marks a surrogate key
+# generated by the database (SERIAL on PostgreSQL, rowid alias on SQLite, a sequence on DuckDB).
+TABLE_SCHEMAS = {
+    'test': [
+        ('id', 'INTEGER PRIMARY KEY'),
+        ('name', 'VARCHAR(255)'),
+        ('address', 'TEXT'),
+        ('color', 'VARCHAR(50)'),
+        ('created_at', 'TIMESTAMP'),
+        ('last_login', 'TIMESTAMP'),
+        ('is_claimed', 'BOOLEAN'),
+        ('paid_amount', 'NUMERIC(10, 2)'),
+    ],
+    'users': [
+        ('user_id', 'VARCHAR(255) PRIMARY KEY'),
+        ('created_at', 'TIMESTAMP'),
+        ('updated_at', 'TIMESTAMP'),
+        ('logged_at', 'TIMESTAMP'),
+        ('name', 'VARCHAR(255)'),
+        ('dob', 'DATE'),
+        ('address', 'TEXT'),
+        ('username', 'VARCHAR(255)'),
+        ('password', 'VARCHAR(255)'),
+        ('national_id', 'VARCHAR(50)'),
+    ],
+    'telephone_numbers': [
+        ('id', AUTO_ID),
+        ('user_id', 'VARCHAR(255) NOT NULL'),
+        ('telephone_number', 'VARCHAR(50)'),
+    ],
+    'jobs_history': [
+        ('job_id', 'VARCHAR(255) PRIMARY KEY'),
+        ('user_id', 'VARCHAR(255) NOT NULL'),
+        ('occupation', 'VARCHAR(255)'),
+        ('is_fulltime', 'BOOLEAN'),
+        ('start', 'DATE'),
+        ('end', 'DATE'),
+        ('employer', 'VARCHAR(255)'),
+    ],
+}
+
+FOREIGN_KEYS = {
+    'telephone_numbers': [('user_id', 'users', 'user_id')],
+    'jobs_history': [('user_id', 'users', 'user_id')],
+}
+
+
+def quote(identifier: str) -> str:
+    return f'"{identifier}"'
+
+
+def primary_key(table_name: str) -> List[str]:
+    """Declared primary key columns of a shared table (surrogate AUTO_ID keys excluded)."""
+    return [name for name, col_type in TABLE_SCHEMAS.get(table_name, []) if 'PRIMARY KEY' in col_type]
+
+
+def parquet_columns(path: Path) -> List[str]:
+    return list(pl.read_parquet_schema(path))
+
+
+def parquet_row_count(path: Path) -> int:
+    import pyarrow.parquet as pq
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def iter_parquet(path: Path, batch_size: int = PARQUET_BATCH_SIZE,
+                 governor: Optional[MemoryGovernor] = None) -> Iterator[pl.DataFrame]:
+    """Yield a parquet file as DataFrames in file order.
+
+    Batches hold at most `batch_size` rows, or are sized by `governor` when one is given;
+    the governor then starts from the file's uncompressed size, so even the first read
+    step stays within its memory ceiling.
+    """
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path)
+    if governor is not None:
+        metadata = parquet.metadata
+        governor.estimate(sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups)), metadata.num_rows)
+        yield from governor.regroup(parquet.iter_batches(batch_size=governor.read_step()))
+        return
+    for batch in parquet.iter_batches(batch_size=batch_size):
+        yield pl.from_arrow(batch)
+
+
+class CSVBatchStream(io.RawIOBase):
+    """Read-only file object that encodes DataFrame batches as COPY-ready CSV on demand."""
+
+    def __init__(self, batches: Iterable[pl.DataFrame], null_repr: str):
+        self._chunks = (
+            df.write_csv(separator='\t', include_header=False, null_value=null_repr).encode()
+            for df in batches
+        )
+        self._buffer = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer:
+            try:
+                self._buffer = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+class DatabaseBackend(ABC):
+    """Destination database. Subclasses implement the abstract connection, execution
+    and insert methods and how an AUTO_ID column is rendered; the DDL itself is shared.
+    Bulk loads are batched and committed as directed by `governor`."""
+
+    auto_id_type = None
+    governor = None
+    placeholder = '?'
+    null_safe_equals = 'IS NOT DISTINCT FROM'
+
+    @abstractmethod
+    def connect(self):
+        ...
+
+    @abstractmethod
+    def execute(self, sql: str):
+        ...
+
+    @abstractmethod
+    def executemany(self, sql: str, rows: Iterable[tuple]):
+        ...
+
+    def rows(self, df: pl.DataFrame) -> Iterable[tuple]:
+        return df.iter_rows()
+
+    def upsert(self, df: pl.DataFrame, table_name: str, keys: List[str]):
+        """Insert rows, updating in place when the primary key already exists."""
+        columns = ', '.join(quote(col) for col in df.columns)
+        placeholders = ', '.join(self.placeholder for _ in df.columns)
+        updates = ', '.join(f"{quote(col)} = excluded.{quote(col)}" for col in df.columns if col not in keys)
+        conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        self.executemany(
+            f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT ({', '.join(quote(k) for k in keys)}) {conflict}",
+            self.rows(df)
+        )
+
+    def key_equals(self, table_name: str, keys: List[str]) -> str:
+        """Comparison for matching `keys`: `=` on primary key columns, which are NOT NULL and
+        indexed, otherwise NULL-safe equality."""
+        return '=' if set(keys) <= set(primary_key(table_name)) else self.null_safe_equals
+
+    def delete(self, df: pl.DataFrame, table_name: str, keys: List[str]):
+        """Delete rows matching the key values in `df`."""
+        equals = self.key_equals(table_name, keys)
+        condition = ' AND '.join(f"{quote(k)} {equals} {self.placeholder}" for k in keys)
+        self.executemany(f"DELETE FROM {table_name} WHERE {condition}", self.rows(df.select(keys)))
+
+    @abstractmethod
+    def insert(self, df: pl.DataFrame, table_name: str):
+        ...
+
+    def insert_parquet(self, path: Path, table_name: str):
+        """Load a parquet file batch by batch. Backends that read parquet natively override this."""
+        for df in iter_parquet(path, governor=self.governor):
+            self.insert(df, table_name)
+
+    def truncate(self, table_name: str):
+        self.execute(f"DELETE FROM {table_name}")
+
+    @abstractmethod
+    def close(self):
+        ...
+
+    def auto_id(self, table_name: str) -> str:
+        return self.auto_id_type
+
+    def table_ddl(self, table_name: str) -> List[str]:
+        columns = [
+            f"{quote(name)} {self.auto_id(table_name) if col_type == AUTO_ID else col_type}"
+            for name, col_type in TABLE_SCHEMAS[table_name]
+        ]
+        for column, ref_table, ref_column in FOREIGN_KEYS.get(table_name, []):
+            columns.append(f"FOREIGN KEY ({quote(column)}) REFERENCES {ref_table}({quote(ref_column)})")
+        body = ',\n    '.join(columns)
+        return [f"CREATE TABLE IF NOT EXISTS {table_name} (\n    {body}\n)"]
+
+    def create_table(self, table_name: str):
+        if table_name not in TABLE_SCHEMAS:
+            return
+        for statement in self.table_ddl(table_name):
+            self.execute(statement)
+
+
+class PostgresBackend(DatabaseBackend):
+    auto_id_type = 'SERIAL PRIMARY KEY'
+    placeholder = '%s'
+
+    def __init__(self, connection_string: str, governor: Optional[MemoryGovernor] = None):
+        self.connection_string = connection_string
+        self.governor = governor or MemoryGovernor()
+        self.engine = None
+
+    def connect(self, max_retries=5, retry_delay=2):
+        """Create the engine and check the connection with retry logic."""
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.exc import OperationalError
+
+        self.engine = create_engine(
+            self.connection_string,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=True
+        )
+        for attempt in range(max_retries):
+            try:
+                with self.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                return
+            except OperationalError as e:
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay)
+                    continue
+                else:
+                    raise ConnectionError(f"Failed to connect to database after {max_retries} attempts: {e}")
+
+    def execute(self, sql: str):
+        from sqlalchemy import text
+        with self.engine.begin() as conn:
+            conn.execute(text(sql))
+
+    def executemany(self, sql: str, rows: Iterable[tuple]):
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.executemany(sql, list(rows))
+            raw_conn.commit()
+            cursor.close()
+        finally:
+            raw_conn.close()
+
+    def truncate(self, table_name: str):
+        self.execute(f"TRUNCATE TABLE {table_name} CASCADE")
+
+    def upsert(self, df: pl.DataFrame, table_name: str, keys: List[str]):
+        """COPY the rows into a staging table and merge them with one INSERT ... ON CONFLICT."""
+        columns = ', '.join(quote(col) for col in df.columns)
+        updates = ', '.join(f"{quote(col)} = excluded.{quote(col)}" for col in df.columns if col not in keys)
+        conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        self._merge(df, table_name, (
+            f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {STAGING_TABLE} "
+            f"ON CONFLICT ({', '.join(quote(k) for k in keys)}) {conflict}"
+        ))
+
+    def delete(self, df: pl.DataFrame, table_name: str, keys: List[str]):
+        """COPY the key values into a staging table and delete the matching rows with one DELETE ... USING."""
+        equals = self.key_equals(table_name, keys)
+        condition = ' AND '.join(f"{table_name}.{quote(k)} {equals} s.{quote(k)}" for k in keys)
+        self._merge(df.select(keys), table_name, f"DELETE FROM {table_name} USING {STAGING_TABLE} s WHERE {condition}")
+
+    def _merge(self, df: pl.DataFrame, table_name: str, statement: str):
+        """Stage `df` in a temporary table shaped like the target's columns, then run `statement` in the same transaction."""
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            column_list = ', '.join(quote(col) for col in df.columns)
+            try:
+                # CREATE TABLE AS copies column types but not constraints, so key-only rows stage fine
+                cursor.execute(
+                    f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+                    f"SELECT {column_list} FROM {table_name} WITH NO DATA"
+                )
+                batches = CSVBatchStream(self.governor.split(df), COPY_NULL)
+                cursor.copy_expert(self._copy_sql(STAGING_TABLE, df.columns), batches, size=1 << 20)
+                # Row estimates for the join; a fresh temp table has no statistics
+                cursor.execute(f"ANALYZE {STAGING_TABLE}")
+                cursor.execute(statement)
+                raw_conn.commit()
+            except Exception:
+                raw_conn.rollback()
+                raise
+            cursor.close()
+        finally:
+            raw_conn.close()
+
+    def insert(self, df: pl.DataFrame, table_name: str):
+        self._copy(table_name, df.columns, lambda: self.governor.split(df))
+
+    def insert_parquet(self, path: Path, table_name: str):
+        """Stream a parquet file into COPY in governed batches."""
+        self._copy(table_name, parquet_columns(path), lambda: iter_parquet(path, governor=self.governor))
+
+    @staticmethod
+    def _copy_sql(table_name: str, columns: List[str]) -> str:
+        column_list = ', '.join(quote(col) for col in columns)
+        return f"COPY {table_name} ({column_list}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '{COPY_NULL}')"
+
+    def _copy(self, table_name: str, columns: List[str], batches: Callable[[], Iterable[pl.DataFrame]]):
+        """Fast bulk insert using PostgreSQL COPY for better performance.
+
+        Each batch is sent as its own COPY, timed to size the next one, and the transaction is
+        committed every `governor.commit_rows` rows. `batches` is called again if the load has
+        to be retried, so the data can be re-streamed.
+        """
+        # Get raw connection for COPY
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+
+            copy_sql = self._copy_sql(table_name, columns)
+
+            def copy_all():
+                rows_since_commit = 0
+                for df in batches():
+                    start = time.perf_counter()
+                    cursor.copy_expert(copy_sql, CSVBatchStream([df], COPY_NULL), size=1 << 20)
+                    self.governor.observe(df.height, time.perf_counter() - start)
+                    rows_since_commit += df.height
+                    if self.governor.should_commit(rows_since_commit):
+                        raw_conn.commit()
+                        rows_since_commit = 0
+                raw_conn.commit()
+
+            # For tables with primary keys, we need to handle duplicates
+            try:
+                copy_all()
+            except Exception as e:
+                # If duplicate key error, truncate and retry (this also drops batches committed so far)
+                if 'duplicate key' in str(e).lower() or 'unique constraint' in str(e).lower():
+                    raw_conn.rollback()
+                    cursor.execute(f"TRUNCATE TABLE {table_name} CASCADE")
+                    copy_all()
+                else:
+                    raw_conn.rollback()
+                    raise
+            cursor.close()
+        finally:
+            raw_conn.close()
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.dispose()
+
+
+class SQLiteBackend(DatabaseBackend):
+    auto_id_type = 'INTEGER PRIMARY KEY'
+    null_safe_equals = 'IS'
+
+    # Tuned for bulk loads: WAL with relaxed syncing, large page cache, in-memory temp storage
+    PRAGMAS = (
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA cache_size=-65536',
+        'PRAGMA foreign_keys=ON',
+    )
+
+    def __init__(self, path: str, governor: Optional[MemoryGovernor] = None):
+        self.path = path
+        self.governor = governor or MemoryGovernor()
+        self.conn = None
+
+    def connect(self):
+        import sqlite3
+        try:
+            self.conn = sqlite3.connect(self.path)
+            for pragma in self.PRAGMAS:
+                self.conn.execute(pragma)
+        except sqlite3.Error as e:
+            raise ConnectionError(f"Failed to open SQLite database {self.path}: {e}")
+
+    def execute(self, sql: str):
+        with self.conn:
+            self.conn.execute(sql)
+
+    def executemany(self, sql: str, rows: Iterable[tuple]):
+        with self.conn:
+            self.conn.executemany(sql, rows)
+
+    def rows(self, df: pl.DataFrame) -> Iterable[tuple]:
+        # sqlite3 has no native temporal types; store ISO-8601 text
+        return df.with_columns(
+            pl.col(pl.Datetime).dt.to_string('%Y-%m-%d %H:%M:%S%.f'),
+            pl.col(pl.Date).dt.to_string('%Y-%m-%d'),
+        ).iter_rows()
+
+    def insert(self, df: pl.DataFrame, table_name: str):
+        """Bulk insert with executemany, committing every `governor.commit_rows` rows."""
+        self._insert_batches(self.governor.split(df), table_name)
+
+    def insert_parquet(self, path: Path, table_name: str):
+        self._insert_batches(iter_parquet(path, governor=self.governor), table_name)
+
+    def _insert_batches(self, batches: Iterable[pl.DataFrame], table_name: str):
+        statement = None
+        rows_since_commit = 0
+        try:
+            for df in batches:
+                if statement is None:
+                    columns = ', '.join(quote(col) for col in df.columns)
+                    placeholders = ', '.join('?' for _ in df.columns)
+                    statement = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+                start = time.perf_counter()
+                self.conn.executemany(statement, self.rows(df))
+                self.governor.observe(df.height, time.perf_counter() - start)
+                rows_since_commit += df.height
+                if self.governor.should_commit(rows_since_commit):
+                    self.conn.commit()
+                    rows_since_commit = 0
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+class DuckDBBackend(DatabaseBackend):
+    def __init__(self, path: str, governor: Optional[MemoryGovernor] = None):
+        self.path = path
+        self.governor = governor or MemoryGovernor()
+        self.conn = None
+
+    def connect(self):
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("DuckDB backend requires the duckdb package: pip install duckdb")
+        try:
+            self.conn = duckdb.connect(self.path)
+            # DuckDB batches and spills on its own; the governor's ceiling becomes its memory limit
+            self.conn.execute(f"SET memory_limit = '{self.governor.memory_limit // (1024 * 1024)}MB'")
+        except duckdb.Error as e:
+            raise ConnectionError(f"Failed to open DuckDB database {self.path}: {e}")
+
+    def auto_id(self, table_name: str) -> str:
+        return f"INTEGER PRIMARY KEY DEFAULT nextval('{table_name}_id_seq')"
+
+    def table_ddl(self, table_name: str) -> List[str]:
+        statements = super().table_ddl(table_name)
+        if any(col_type == AUTO_ID for _, col_type in TABLE_SCHEMAS[table_name]):
+            statements.insert(0, f"CREATE SEQUENCE IF NOT EXISTS {table_name}_id_seq")
+        return statements
+
+    def execute(self, sql: str):
+        self.conn.execute(sql)
+
+    def executemany(self, sql: str, rows: Iterable[tuple]):
+        rows = list(rows)
+        if rows:
+            self.conn.executemany(sql, rows)
+
+    def insert(self, df: pl.DataFrame, table_name: str):
+        """Insert straight from Arrow memory; DuckDB scans the registered table without copying."""
+        columns = ', '.join(quote(col) for col in df.columns)
+        self.conn.register('etl_batch', df.to_arrow())
+        try:
+            self.conn.execute(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM etl_batch")
+        finally:
+            self.conn.unregister('etl_batch')
+
+    def insert_parquet(self, path: Path, table_name: str):
+        """Hand the file to DuckDB's parquet reader; no rows pass through Python."""
+        columns = ', '.join(quote(col) for col in parquet_columns(path))
+        self.conn.execute(
+            f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM read_parquet(?)",
+            [str(path)]
+        )
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
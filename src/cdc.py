@@ -0,0 +1,186 @@
+import hashlib
+import json
+import polars as pl
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from .storage import ObjectStore, write_atomic, link_atomic, write_json_atomic
+
+OP_COLUMN = '_op'
+VERSION_COLUMN = '_version'
+MATCHED = '_matched'
+PREVIOUS_SUFFIX = '__previous'
+
+# Primary keys used to match rows between versions. `None` is the single-table (CSV) case;
+# tables without an entry are compared on the whole row, so they only produce inserts and deletes.
+PRIMARY_KEYS = {
+    None: ['id'],
+    'users': ['user_id'],
+    'jobs_history': ['job_id'],
+}
+
+
+def _align(previous: pl.DataFrame, schema: pl.Schema) -> pl.DataFrame:
+    """`previous` with the columns and dtypes of the current version; missing columns are null."""
+    return previous.select([
+        (pl.col(name).cast(dtype, strict=False) if name in previous.columns else pl.lit(None, dtype=dtype)).alias(name)
+        for name, dtype in schema.items()
+    ])
+
+
+def compute_delta(previous: pl.DataFrame, current: pl.DataFrame, keys: List[str]) -> pl.DataFrame:
+    """Row-level changes from `previous` to `current`, matched on the `keys` columns (nulls equal).
+
+    Returns the changed rows (current values for inserts/updates, previous values for
+    deletes) with an `_op` column of 'insert', 'update' or 'delete'.
+    """
+    previous = _align(previous, current.schema)
+    columns = current.columns
+    values = [c for c in columns if c not in keys]
+
+    matched = current.join(
+        previous.unique(subset=keys, keep='first', maintain_order=True)
+        .select(*keys, *[pl.col(c).alias(c + PREVIOUS_SUFFIX) for c in values], pl.lit(True).alias(MATCHED)),
+        on=keys,
+        how='left',
+        nulls_equal=True,
+        maintain_order='left'
+    )
+    changed = pl.any_horizontal([pl.col(c).ne_missing(pl.col(c + PREVIOUS_SUFFIX)) for c in values]) if values else pl.lit(False)
+    inserted = matched.filter(pl.col(MATCHED).is_null())
+    updated = matched.filter(pl.col(MATCHED).is_not_null() & changed)
+    deleted = previous.join(current.select(keys), on=keys, how='anti', nulls_equal=True)
+
+    return pl.concat([
+        inserted.select(columns).with_columns(pl.lit('insert').alias(OP_COLUMN)),
+        updated.select(columns).with_columns(pl.lit('update').alias(OP_COLUMN)),
+        deleted.with_columns(pl.lit('delete').alias(OP_COLUMN)),
+    ])
+
+
+class ChangeTracker:
+    """Keeps versioned snapshots of object store tables and writes the delta between consecutive versions.
+
+    Layout under the object store root:
+        versions/<name>/<version>.parquet   full snapshot
+        deltas/<name>/<version>.parquet     changes since the previous version
+        applied/<destination>/<key>.json    last version loaded into each destination
+    where <name> is the store key, or `<key>_<table>` for multi-table keys.
+    The first version's delta contains every row as an insert.
+    """
+
+    def __init__(self, object_store: ObjectStore, keep_versions: int = 10):
+        self.versions_path = object_store.base_path / 'versions'
+        self.deltas_path = object_store.base_path / 'deltas'
+        self.applied_path = object_store.base_path / 'applied'
+        self.keep_versions = keep_versions
+
+    def track(self, key: str, data: Any, stored: Any = None) -> Dict[Optional[str], dict]:
+        """Snapshot `data` as a new version and return {table_name: change} for every table tracked.
+
+        `stored` is what `ObjectStore.locate` returns for the file(s) `data` was just saved to;
+        snapshots are then hard links to those files instead of copies.
+        Each change is a dict with the version `name`, `version`, `path` (the delta file), `keys`
+        and per-op counts.
+        """
+        tables = data if isinstance(data, dict) else {None: data}
+        sources = stored if isinstance(stored, dict) else {None: stored}
+        changes = {}
+        for table_name, df in tables.items():
+            if df.width == 0:
+                continue
+            name = key if table_name is None else f"{key}_{table_name}"
+            keys = PRIMARY_KEYS.get(table_name) or df.columns
+            changes[table_name] = self._track_table(name, df, keys, sources.get(table_name))
+        return changes
+
+    def _applied_file(self, key: str, destination: str) -> Path:
+        digest = hashlib.sha1(destination.encode()).hexdigest()[:16]
+        return self.applied_path / digest / f"{key}.json"
+
+    def applied(self, key: str, destination: str) -> Dict[str, int]:
+        """{name: version} last loaded into `destination` for a store key."""
+        try:
+            with open(self._applied_file(key, destination)) as f:
+                return json.load(f)['versions']
+        except FileNotFoundError:
+            return {}
+
+    def mark_applied(self, key: str, destination: str, changes: Dict[Optional[str], dict]):
+        path = self._applied_file(key, destination)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        versions = {change['name']: change['version'] for change in changes.values()}
+        write_json_atomic({'destination': destination, 'versions': versions}, path)
+
+    def forget(self, key: str, destination: str):
+        """Drop the applied versions, e.g. before a full reload; the next incremental load becomes full."""
+        self._applied_file(key, destination).unlink(missing_ok=True)
+
+    def pending(self, key: str, changes: Dict[Optional[str], dict], destination: str) -> Optional[Dict[Optional[str], dict]]:
+        """The changes with `paths` set to every delta `destination` has not applied yet, oldest first.
+
+        Returns None when the destination's state is unknown (never loaded, or the deltas needed
+        were pruned), in which case it needs a full load. Tables already up to date are left out.
+        """
+        applied = self.applied(key, destination)
+        pending = {}
+        for table_name, change in changes.items():
+            last = applied.get(change['name'])
+            if last is None:
+                return None
+            paths = [self.delta_path(change['name'], v) for v in range(last + 1, change['version'] + 1)]
+            if not all(path.exists() for path in paths):
+                return None
+            if paths:
+                pending[table_name] = {**change, 'paths': paths}
+        return pending
+
+    def versions(self, name: str) -> List[int]:
+        directory = self.versions_path / name
+        if not directory.exists():
+            return []
+        return sorted(int(p.stem) for p in directory.glob('*.parquet') if p.stem.isdigit())
+
+    def delta_path(self, name: str, version: int) -> Path:
+        return self.deltas_path / name / f"{version:06d}.parquet"
+
+    def snapshot_path(self, name: str, version: int) -> Path:
+        return self.versions_path / name / f"{version:06d}.parquet"
+
+    def _track_table(self, name: str, df: pl.DataFrame, keys: List[str], source: Optional[Path]) -> dict:
+        existing = self.versions(name)
+        version = existing[-1] + 1 if existing else 1
+
+        if existing:
+            previous = pl.read_parquet(self.snapshot_path(name, existing[-1]))
+            delta = compute_delta(previous, df, keys)
+        else:
+            delta = df.with_columns(pl.lit('insert').alias(OP_COLUMN))
+        delta = delta.with_columns(pl.lit(version).alias(VERSION_COLUMN))
+
+        snapshot = self.snapshot_path(name, version)
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        if source is not None:
+            link_atomic(Path(source), snapshot)
+        else:
+            write_atomic(df, snapshot)
+        self.delta_path(name, version).parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(delta, self.delta_path(name, version))
+
+        self._prune(name, existing + [version])
+
+        ops = delta[OP_COLUMN]
+        return {
+            'name': name,
+            'version': version,
+            'path': self.delta_path(name, version),
+            'keys': keys,
+            'inserted': int((ops == 'insert').sum()),
+            'updated': int((ops == 'update').sum()),
+            'deleted': int((ops == 'delete').sum()),
+        }
+
+    def _prune(self, name: str, versions: List[int]):
+        for version in versions[:-self.keep_versions]:
+            for path in (self.snapshot_path(name, version), self.delta_path(name, version)):
+                if path.exists():
+                    path.unlink()
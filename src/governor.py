@@ -0,0 +1,94 @@
+import polars as pl
+from typing import Iterable, Iterator, Optional
+
+DEFAULT_MEMORY_LIMIT = 512 * 1024 * 1024
+DEFAULT_COMMIT_ROWS = 1_000_000
+# A batch is held several times over while it is loaded: as Arrow, as a Polars frame and encoded for the database
+MEMORY_OVERHEAD = 4
+# Throughput sizing never goes below this many rows; the memory ceiling can
+MIN_BATCH_ROWS = 1024
+INITIAL_BATCH_ROWS = 65536
+# Parquet is read in steps of at most this many rows (fewer if the memory ceiling says so) and regrouped into governed batches
+READ_STEP_ROWS = 8192
+TARGET_BATCH_SECONDS = 1.0
+SMOOTHING = 0.5
+
+
+def _smooth(previous: Optional[float], sample: float) -> float:
+    return sample if previous is None else SMOOTHING * sample + (1 - SMOOTHING) * previous
+
+
+class MemoryGovernor:
+    """Chooses load batch sizes from a memory ceiling and what it observes while loading.
+
+    Batches never exceed `memory_limit` given the measured bytes per row of the data; within
+    that ceiling they grow or shrink so each database round trip takes about `target_seconds`.
+    Backends commit every `commit_rows` rows (0 keeps the whole load in one transaction).
+    """
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT, commit_rows: int = DEFAULT_COMMIT_ROWS,
+                 target_seconds: float = TARGET_BATCH_SECONDS):
+        self.memory_limit = memory_limit
+        self.commit_rows = commit_rows
+        self.target_seconds = target_seconds
+        self.bytes_per_row = None
+        self.rows_per_second = None
+
+    def estimate(self, nbytes: int, rows: int):
+        """Start sizing new data from its size before any of it is read, dropping earlier measurements."""
+        self.bytes_per_row = nbytes / rows if rows else None
+
+    def measure(self, nbytes: int, rows: int):
+        """Record the in-memory size of `rows` rows of the data being loaded."""
+        if rows:
+            self.bytes_per_row = _smooth(self.bytes_per_row, nbytes / rows)
+
+    def observe(self, rows: int, seconds: float):
+        """Record how long the database took to accept a batch."""
+        if rows and seconds > 0:
+            self.rows_per_second = _smooth(self.rows_per_second, rows / seconds)
+
+    @property
+    def max_rows(self) -> int:
+        if not self.bytes_per_row:
+            return INITIAL_BATCH_ROWS
+        return max(1, int(self.memory_limit / (self.bytes_per_row * MEMORY_OVERHEAD)))
+
+    def batch_rows(self) -> int:
+        target = INITIAL_BATCH_ROWS if self.rows_per_second is None else self.rows_per_second * self.target_seconds
+        return min(self.max_rows, max(MIN_BATCH_ROWS, int(target)))
+
+    def should_commit(self, rows_since_commit: int) -> bool:
+        return bool(self.commit_rows) and rows_since_commit >= self.commit_rows
+
+    def read_step(self) -> int:
+        return min(READ_STEP_ROWS, self.max_rows)
+
+    def split(self, df: pl.DataFrame) -> Iterator[pl.DataFrame]:
+        """Yield zero-copy slices of an in-memory frame, sized as the load progresses."""
+        self.estimate(df.estimated_size(), df.height)
+        offset = 0
+        while offset < df.height:
+            rows = self.batch_rows()
+            yield df.slice(offset, rows)
+            offset += rows
+
+    def regroup(self, batches: Iterable) -> Iterator[pl.DataFrame]:
+        """Combine Arrow record batches into governed DataFrames, measuring each as it is read.
+
+        Pending rows are re-sliced (zero-copy) whenever they reach the batch size, so a read
+        step larger than the current batch size never produces an oversized batch.
+        """
+        import pyarrow as pa
+        pending = None
+        for batch in batches:
+            self.measure(batch.nbytes, batch.num_rows)
+            table = pa.Table.from_batches([batch])
+            pending = table if pending is None else pa.concat_tables([pending, table])
+            rows = self.batch_rows()
+            while pending.num_rows >= rows:
+                yield pl.from_arrow(pending.slice(0, rows), rechunk=False)
+                pending = pending.slice(rows)
+                rows = self.batch_rows()
+        if pending is not None and pending.num_rows:
+            yield pl.from_arrow(pending, rechunk=False)
@@ -1,101 +1,73 @@
 import os
-import time
-import pandas as pd
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import OperationalError
-from typing import Any
+import polars as pl
+from pathlib import Path
+from typing import Any, Dict, List
+from .backends import PostgresBackend, SQLiteBackend, DuckDBBackend, parquet_columns, parquet_row_count, primary_key
+from .governor import MemoryGovernor
+from .storage import is_pandas_frame
+from .cdc import OP_COLUMN, VERSION_COLUMN
+
+EMBEDDED_DB_TYPES = {
+    'sqlite': SQLiteBackend,
+    'duckdb': DuckDBBackend,
+}
 
 
 class SQLLoader:
     def __init__(self):
         self.db_type = os.getenv('DB_TYPE', 'postgresql').lower()
-        self.db_host = os.getenv('DB_HOST')
-        self.db_port = os.getenv('DB_PORT')
-        self.db_user = os.getenv('DB_USER')
-        self.db_password = os.getenv('DB_PASSWORD')
-        self.db_name = os.getenv('DB_NAME')
+        # Batch sizes are derived from this memory ceiling; LOAD_COMMIT_ROWS=0 loads each table in one transaction
+        self.governor = MemoryGovernor(
+            memory_limit=int(os.getenv('LOAD_MEMORY_MB', '512')) * 1024 * 1024,
+            commit_rows=int(os.getenv('LOAD_COMMIT_ROWS', '1000000'))
+        )
         
-        if not all([self.db_host, self.db_port, self.db_user, self.db_password, self.db_name]):
-            raise ValueError("Missing required database credentials: DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME")
+        if self.db_type in EMBEDDED_DB_TYPES:
+            self.db_path = os.getenv('DB_PATH', f"./etl_database.{self.db_type}")
+            self.backend = EMBEDDED_DB_TYPES[self.db_type](self.db_path, self.governor)
+        else:
+            self.db_host = os.getenv('DB_HOST')
+            self.db_port = os.getenv('DB_PORT')
+            self.db_user = os.getenv('DB_USER')
+            self.db_password = os.getenv('DB_PASSWORD')
+            self.db_name = os.getenv('DB_NAME')
+            
+            self.connection_string = self._build_connection_string()
+            
+            if not all([self.db_host, self.db_port, self.db_user, self.db_password, self.db_name]):
+                raise ValueError("Missing required database credentials: DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME")
+            
+            self.backend = PostgresBackend(self.connection_string, self.governor)
         
-        self.connection_string = self._build_connection_string()
-        self.engine = None  # Will be initialized on first use
-    
-    def _check_connection(self, max_retries=5, retry_delay=2):
-        """Check database connection with retry logic."""
-        for attempt in range(max_retries):
-            try:
-                with self.engine.connect() as conn:
-                    conn.execute(text("SELECT 1"))
-                return
-            except OperationalError as e:
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    continue
-                else:
-                    raise ConnectionError(f"Failed to connect to database after {max_retries} attempts: {e}")
+        self._connected = False  # Connection is opened on first use
     
     def _build_connection_string(self):
         if self.db_type == 'postgresql' or self.db_type == 'postgres':
-            return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+            # The COPY paths use psycopg2's cursor API; name the driver so SQLAlchemy doesn't pick another
+            return f"postgresql+psycopg2://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
         else:
-            raise ValueError(f"Unsupported database type: {self.db_type}. Only PostgreSQL is supported.")
-
+            supported = ', '.join(['postgresql'] + list(EMBEDDED_DB_TYPES))
+            raise ValueError(f"Unsupported database type: {self.db_type}. Supported types: {supported}.")
+    
+    @property
+    def destination(self) -> str:
+        """Identifies the database being loaded, without credentials."""
+        if self.db_type in EMBEDDED_DB_TYPES:
+            return f"{self.db_type}:{os.path.abspath(self.db_path)}"
+        return f"postgresql://{self.db_host}:{self.db_port}/{self.db_name}"
+    
+    @property
+    def engine(self):
+        """SQLAlchemy engine (PostgreSQL only)."""
+        return getattr(self.backend, 'engine', None)
+    
     def _ensure_engine(self):
-        """Initialize engine and check connection only when needed."""
-        if self.engine is None:
-            self.engine = create_engine(
-                self.connection_string,
-                pool_size=10,
-                max_overflow=20,
-                pool_pre_ping=True
-            )
-            self._check_connection()
-    
-    def _fast_insert_postgresql(self, df: pd.DataFrame, table_name: str):
-        """Fast bulk insert using PostgreSQL COPY for better performance."""
-        import io
-        
-        # Get raw connection for COPY
-        raw_conn = self.engine.raw_connection()
-        try:
-            cursor = raw_conn.cursor()
-            
-            # Create StringIO buffer
-            output = io.StringIO()
-            
-            # Write DataFrame to CSV format in memory (use \\N for NULL)
-            null_repr = '\\N'
-            df.to_csv(output, sep='\t', header=False, index=False, na_rep=null_repr)
-            output.seek(0)
-            
-            # Use COPY FROM for fast bulk insert
-            columns = ', '.join([f'"{col}"' for col in df.columns])
-            # Use ON CONFLICT DO NOTHING to handle duplicates gracefully
-            copy_sql = f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '{null_repr}')"
-            
-            # For tables with primary keys, we need to handle duplicates
-            # Check if table has primary key by trying to insert and handling conflict
-            try:
-                cursor.copy_expert(copy_sql, output)
-                raw_conn.commit()
-            except Exception as e:
-                # If duplicate key error, truncate and retry, or use temp table approach
-                if 'duplicate key' in str(e).lower() or 'unique constraint' in str(e).lower():
-                    raw_conn.rollback()
-                    # Truncate table and retry
-                    cursor.execute(f"TRUNCATE TABLE {table_name} CASCADE")
-                    output.seek(0)
-                    cursor.copy_expert(copy_sql, output)
-                    raw_conn.commit()
-                else:
-                    raise
-            cursor.close()
-        finally:
-            raw_conn.close()
+        """Open the backend connection only when needed."""
+        if not self._connected:
+            self.backend.connect()
+            self._connected = True
     
-    def load(self, data: Any, target: str):
-        import polars as pl
+    def _connect_for_load(self):
         try:
             self._ensure_engine()
         except ConnectionError as e:
@@ -104,102 +76,107 @@ class SQLLoader:
                 f"Data has been saved to object store but could not be loaded into database. "
                 f"Please check database connection and try again."
             ) from e
+    
+    def _ordered_tables(self, data: dict):
+        # Create tables in correct order (users first, then dependent tables)
+        table_order = ['users', 'telephone_numbers', 'jobs_history']
+        return [(table_name, data[table_name]) for table_name in table_order if table_name in data]
+    
+    def load(self, data: Any, target: str):
+        self._connect_for_load()
         
-        # Use COPY method for PostgreSQL (much faster than INSERT)
-        chunksize = 50000  # Fallback chunksize for non-PostgreSQL
-        if isinstance(data, pl.DataFrame):
-            # Convert Polars to pandas only for database write
-            df_pd = data.to_pandas()
-            # Create table first
-            self._create_table(df_pd, target)
-            if self.db_type == 'postgresql' or self.db_type == 'postgres':
-                self._fast_insert_postgresql(df_pd, target)
-            else:
-                df_pd.to_sql(target, self.engine, if_exists='append', index=False, chunksize=chunksize, method='multi')
-        elif isinstance(data, pd.DataFrame):
-            # Create table first
-            self._create_table(data, target)
-            if self.db_type == 'postgresql' or self.db_type == 'postgres':
-                self._fast_insert_postgresql(data, target)
-            else:
-                data.to_sql(target, self.engine, if_exists='append', index=False, chunksize=chunksize, method='multi')
+        if isinstance(data, pl.DataFrame) or is_pandas_frame(data):
+            self._load_table(data, target)
         elif isinstance(data, dict):
-            # Create tables in correct order (users first, then dependent tables)
-            table_order = ['users', 'telephone_numbers', 'jobs_history']
-            for table_name in table_order:
-                if table_name in data:
-                    df = data[table_name]
-                    if isinstance(df, pl.DataFrame):
-                        df = df.to_pandas()
-                    # Create table first
-                    self._create_table(df, table_name)
-                    if self.db_type == 'postgresql' or self.db_type == 'postgres':
-                        self._fast_insert_postgresql(df, table_name)
-                    else:
-                        df.to_sql(table_name, self.engine, if_exists='append', index=False, chunksize=chunksize, method='multi')
-    
-    def _create_table(self, df: pd.DataFrame, table_name: str):
-        from sqlalchemy import inspect
-        inspector = inspect(self.engine)
-        if inspector.has_table(table_name):
-            return
+            for table_name, df in self._ordered_tables(data):
+                self._load_table(df, table_name)
+    
+    def load_parquet(self, paths: Any, target: str):
+        """Load parquet files from the object store without materializing whole DataFrames.
+        
+        `paths` is a single file (loaded into `target`) or a {table_name: path} dict,
+        as returned by `ObjectStore.locate`.
+        """
+        self._connect_for_load()
+        
+        if isinstance(paths, (str, Path)):
+            self._load_parquet_table(Path(paths), target)
+        elif isinstance(paths, dict):
+            for table_name, path in self._ordered_tables(paths):
+                self._load_parquet_table(Path(path), table_name)
+    
+    def _load_table(self, df: Any, table_name: str):
+        if is_pandas_frame(df):
+            df = pl.from_pandas(df)
+        self.backend.create_table(table_name)
+        if df.width and df.height:
+            self.backend.insert(df, table_name)
+    
+    def _load_parquet_table(self, path: Path, table_name: str):
+        self.backend.create_table(table_name)
+        if parquet_columns(path) and parquet_row_count(path):
+            self.backend.insert_parquet(path, table_name)
+    
+    def apply_changes(self, changes: Dict[str, dict], target: str = None):
+        """Apply object store deltas (see `ChangeTracker`) instead of reloading whole tables.
         
-        with self.engine.connect() as conn:
-            if table_name == 'test':
-                conn.execute(text("""
-                    CREATE TABLE IF NOT EXISTS test (
-                        id INTEGER PRIMARY KEY,
-                        name VARCHAR(255),
-                        address TEXT,
-                        color VARCHAR(50),
-                        created_at TIMESTAMP,
-                        last_login TIMESTAMP,
-                        is_claimed BOOLEAN,
-                        paid_amount NUMERIC(10, 2)
-                    )
-                """))
-            elif table_name == 'users':
-                conn.execute(text("""
-                    CREATE TABLE IF NOT EXISTS users (
-                        user_id VARCHAR(255) PRIMARY KEY,
-                        created_at TIMESTAMP,
-                        updated_at TIMESTAMP,
-                        logged_at TIMESTAMP,
-                        name VARCHAR(255),
-                        dob DATE,
-                        address TEXT,
-                        username VARCHAR(255),
-                        password VARCHAR(255),
-                        national_id VARCHAR(50)
-                    )
-                """))
-            elif table_name == 'telephone_numbers':
-                conn.execute(text("""
-                    CREATE TABLE IF NOT EXISTS telephone_numbers (
-                        id SERIAL PRIMARY KEY,
-                        user_id VARCHAR(255) NOT NULL,
-                        telephone_number VARCHAR(50),
-                        FOREIGN KEY (user_id) REFERENCES users(user_id)
-                    )
-                """))
-            elif table_name == 'jobs_history':
-                conn.execute(text("""
-                    CREATE TABLE IF NOT EXISTS jobs_history (
-                        job_id VARCHAR(255) PRIMARY KEY,
-                        user_id VARCHAR(255) NOT NULL,
-                        occupation VARCHAR(255),
-                        is_fulltime BOOLEAN,
-                        start DATE,
-                        "end" DATE,
-                        employer VARCHAR(255),
-                        FOREIGN KEY (user_id) REFERENCES users(user_id)
-                    )
-                """))
-            conn.commit()
+        `changes` maps table name to a change dict with the matching `keys` and either the delta
+        `path` or a list of consecutive delta `paths`, oldest first, which are applied as one;
+        a `None` table name is the single-table case and is loaded into `target`.
+        Deletes run children first, inserts/upserts parents first.
+        """
+        self._connect_for_load()
+        
+        changes = {(target if name is None else name): change for name, change in changes.items()}
+        ordered = [name for name, _ in self._ordered_tables(changes)]
+        ordered += [name for name in changes if name not in ordered]
+        deltas = {name: self._read_deltas(changes[name]) for name in ordered}
+        
+        for table_name in ordered:
+            self.backend.create_table(table_name)
+        
+        for table_name in reversed(ordered):
+            delta = deltas[table_name]
+            if primary_key(table_name):
+                removed = delta.filter(pl.col(OP_COLUMN) == 'delete')
+            else:
+                # Rows without a primary key are matched on every column: remove each changed row
+                # before re-inserting it, so a re-applied delta doesn't duplicate rows
+                removed = delta
+            if removed.height:
+                self.backend.delete(removed, table_name, primary_key(table_name) or changes[table_name]['keys'])
+        
+        for table_name in ordered:
+            delta = deltas[table_name]
+            keys = primary_key(table_name)
+            written = delta.filter(pl.col(OP_COLUMN).is_in(['insert', 'update'])).drop(OP_COLUMN, VERSION_COLUMN)
+            if not written.height:
+                continue
+            if keys:
+                self.backend.upsert(written, table_name, keys)
+            else:
+                self.backend.insert(written, table_name)
+    
+    def _read_deltas(self, change: dict) -> pl.DataFrame:
+        paths = change.get('paths') or [change['path']]
+        delta = pl.concat([pl.read_parquet(path) for path in paths], how='diagonal_relaxed')
+        if len(paths) > 1:
+            # Only the last change to each row counts
+            delta = delta.unique(subset=change['keys'], keep='last', maintain_order=True)
+        return delta
+    
+    def clear(self, table_names: List[str]):
+        """Remove existing rows from tables, children first. Missing tables are skipped."""
+        self._ensure_engine()
+        for table_name in table_names:
+            try:
+                self.backend.truncate(table_name)
+            except Exception:
+                continue  # Table might not exist yet
     
     def close(self):
-        if self.engine is not None:
-            self.engine.dispose()
+        if self._connected:
+            self.backend.close()
 
 
 class ObjectStoreLoader:
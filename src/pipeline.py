@@ -1,12 +1,12 @@
 import os
 from typing import Any
-import pandas as pd
 from .extractors import CSVExtractor, JSONExtractor
 from .transformers import CSVTransformer, JSONTransformer
-from .loaders import SQLLoader
+from .validators import CSVValidator, JSONValidator
 from .storage import ObjectStore
+from .cdc import ChangeTracker
 from .utils.logger import setup_logger
-import polars as pl
+from .utils.profiling import StageProfiler
 
 logger = setup_logger()
 
@@ -15,16 +15,35 @@ class Pipeline:
     def __init__(self):
         self.object_store_path = os.getenv('OBJECT_STORE_PATH', './output')
         self.data_path = os.getenv('DATA_PATH', './data')
+        # 'full' truncates and reloads tables, 'incremental' applies the deltas the database hasn't seen
+        self.load_strategy = os.getenv('LOAD_STRATEGY', 'full').lower()
         
-        self.object_store = ObjectStore(self.object_store_path)
+        self.object_store = ObjectStore(self.object_store_path, int(os.getenv('STORE_CACHE_MB', '256')) * 1024 * 1024)
+        self.quarantine_store = ObjectStore(os.path.join(self.object_store_path, 'quarantine'))
+        self.change_tracker = ChangeTracker(self.object_store, int(os.getenv('STORE_VERSIONS_KEEP', '10')))
         self.csv_extractor = CSVExtractor()
         self.json_extractor = JSONExtractor()
-        self.csv_transformer = CSVTransformer()
+        self.csv_transformer = CSVTransformer(
+            parse_currency=os.getenv('PARSE_CURRENCY', '').lower() in ('1', 'true', 'yes'),
+            workers=int(os.getenv('NORMALIZE_WORKERS', '1'))
+        )
         self.json_transformer = JSONTransformer()
-        self.loader = SQLLoader()
+        self.csv_validator = CSVValidator()
+        self.json_validator = JSONValidator()
+        # No-op unless PIPELINE_PROFILE is set
+        self.profiler = StageProfiler()
+        self._loader = None
     
-    def process_csv(self, filename: str):
-        store_key = os.getenv('STORE_KEY')
+    @property
+    def loader(self):
+        """SQL loader, created on first use so store-only runs never import pandas/SQLAlchemy."""
+        if self._loader is None:
+            from .loaders import SQLLoader
+            self._loader = SQLLoader()
+        return self._loader
+    
+    def process_csv(self, filename: str, load: bool = True, store_key: str = None):
+        store_key = store_key or os.getenv('STORE_KEY')
         
         if not store_key:
             raise ValueError("STORE_KEY must be set via environment variables")
@@ -32,16 +51,26 @@ class Pipeline:
         logger.info(f"Processing CSV: {filename}")
         
         file_path = f"{self.data_path}/{filename}"
-        raw_data = self.csv_extractor.extract(file_path)
-        transformed = self.csv_transformer.transform(raw_data)
+        with self.profiler.stage('csv_extract'):
+            raw_data = self.csv_extractor.extract(file_path)
+        with self.profiler.stage('csv_transform'):
+            transformed = self.csv_transformer.transform(raw_data)
+        with self.profiler.stage('csv_validate'):
+            transformed, quarantined, counts = self.csv_validator.validate(transformed, raw_data)
+            self._quarantine(quarantined, counts, store_key)
         
-        self.object_store.save(transformed, store_key, 'parquet')
+        with self.profiler.stage('csv_save'):
+            self.object_store.save(transformed, store_key, 'parquet')
         logger.info(f"Saved to object store: {store_key}.parquet")
+        with self.profiler.stage('csv_track_changes'):
+            changes = self._track_changes(transformed, store_key)
         
-        self.load_from_store(store_key)
+        if load:
+            with self.profiler.stage('csv_load'):
+                self.load_from_store(store_key, changes)
     
-    def process_json(self, filename: str):
-        store_key = os.getenv('STORE_KEY')
+    def process_json(self, filename: str, load: bool = True, store_key: str = None):
+        store_key = store_key or os.getenv('STORE_KEY')
         
         if not store_key:
             raise ValueError("STORE_KEY must be set via environment variables")
@@ -49,31 +78,109 @@ class Pipeline:
         logger.info(f"Processing JSON: {filename}")
         
         file_path = f"{self.data_path}/{filename}"
-        raw_data = self.json_extractor.extract(file_path)
-        transformed = self.json_transformer.transform(raw_data)
+        with self.profiler.stage('json_extract'):
+            raw_data = self.json_extractor.extract(file_path)
+        with self.profiler.stage('json_transform'):
+            transformed, raw_values = self.json_transformer.transform_with_raw(raw_data)
+        with self.profiler.stage('json_validate'):
+            transformed, quarantined, counts = self.json_validator.validate(transformed, raw_values)
+            self._quarantine(quarantined, counts, store_key)
         
-        self.object_store.save(transformed, store_key, 'parquet')
+        with self.profiler.stage('json_save'):
+            self.object_store.save(transformed, store_key, 'parquet')
         logger.info(f"Saved to object store: {store_key}_*.parquet")
+        with self.profiler.stage('json_track_changes'):
+            changes = self._track_changes(transformed, store_key)
+        
+        if load:
+            with self.profiler.stage('json_load'):
+                self.load_from_store(store_key, changes)
+    
+    def _quarantine(self, quarantined: Any, counts: dict, store_key: str):
+        """Write rows that failed validation to the quarantine store and report per-rule counts."""
+        for rule, count in counts.items():
+            if count:
+                logger.warning(f"Validation rule {rule} failed for {count} rows")
+        
+        if isinstance(quarantined, dict):
+            # Empty tables are still written, so a table that is clean now doesn't keep last run's rows
+            quarantined = {k: v for k, v in quarantined.items() if v.width}
+            empty = all(v.is_empty() for v in quarantined.values())
+        else:
+            empty = quarantined.is_empty()
+        if empty:
+            # Nothing failed: drop the previous run's quarantine output for this key
+            self.quarantine_store.delete(store_key)
+            return
+        
+        self.quarantine_store.save(quarantined, store_key, 'parquet')
+        logger.info(f"Quarantined {sum(counts.values())} rule failures to: quarantine/{store_key}")
+    
+    def _track_changes(self, data: Any, store_key: str):
+        """Snapshot the saved data as a new version and write its delta; None if tracking failed."""
+        try:
+            changes = self.change_tracker.track(store_key, data, self.object_store.locate(store_key, 'parquet'))
+        except Exception as e:
+            logger.warning(f"Could not compute changes for {store_key}: {e}")
+            return None
+        for table_name, change in changes.items():
+            logger.info(
+                f"Version {change['version']} of {table_name or store_key}: "
+                f"{change['inserted']} inserted, {change['updated']} updated, {change['deleted']} deleted"
+            )
+        return changes
+    
+    def load_from_store(self, store_key: str, changes: dict = None):
+        """Load a stored key into the database.
+        
+        `changes` is what `ChangeTracker.track` returned for the save. The versions the database
+        holds are recorded once a load succeeds, so an incremental load applies every delta since
+        the last successful one, and falls back to a full load when that isn't possible.
+        """
+        destination = self.loader.destination
+        if changes and self.load_strategy == 'incremental':
+            pending = self.change_tracker.pending(store_key, changes, destination)
+            if pending is not None:
+                self._apply_changes(store_key, pending)
+                self.change_tracker.mark_applied(store_key, destination, changes)
+                return
+            logger.info(f"No applied version recorded for {store_key} in destination, loading in full")
         
-        self.load_from_store(store_key)
+        # From here until the load succeeds the database's contents are unknown
+        self.change_tracker.forget(store_key, destination)
+        self._load_full(store_key)
+        if changes:
+            self.change_tracker.mark_applied(store_key, destination, changes)
     
-    def load_from_store(self, store_key: str):
+    def _apply_changes(self, store_key: str, pending: dict):
+        logger.info(f"Applying changes for {store_key} to destination database")
+        table_name = 'test' if store_key == 'csv_data' else store_key
+        try:
+            self.loader.apply_changes(pending, table_name)
+        except ConnectionError as e:
+            logger.error(f"Database load failed: {e}")
+            logger.info(f"Data has been successfully saved to object store: {store_key}")
+            raise
+        applied = ', '.join(f"{name or store_key} ({len(change['paths'])} deltas)" for name, change in pending.items())
+        logger.info(f"Applied changes for {store_key} to destination: {applied or 'up to date'}")
+    
+    def _load_full(self, store_key: str):
         logger.info(f"Loading from object store: {store_key} to destination database")
-        data = self.object_store.load(store_key, 'parquet')
-        if isinstance(data, pl.DataFrame):
-            data = data.to_pandas()
-        elif isinstance(data, dict):
-            data = {k: (v.to_pandas() if isinstance(v, pl.DataFrame) else v) for k, v in data.items()}
+        # Hand file paths to the loader; parquet is streamed batch by batch, never read whole
+        paths = self.object_store.locate(store_key, 'parquet')
+        if paths is None:
+            logger.warning(f"Nothing found in object store for key: {store_key}")
+            return
         try:
             # Determine table name (CSV data goes to 'test' table, JSON uses store_key)
-            if isinstance(data, pd.DataFrame):
-                table_name = 'test' if store_key == 'csv_data' else store_key
-            else:
+            if isinstance(paths, dict):
                 table_name = store_key  # For dict (JSON data), use store_key
+            else:
+                table_name = 'test' if store_key == 'csv_data' else store_key
             
             # Clear existing data before loading to avoid duplicates
-            self._clear_existing_data(data, store_key)
-            self.loader.load(data, table_name)
+            self._clear_existing_data(paths, store_key)
+            self.loader.load_parquet(paths, table_name)
             logger.info(f"Loaded {store_key} from object store to destination")
         except ConnectionError as e:
             logger.error(f"Database load failed: {e}")
@@ -82,35 +189,21 @@ class Pipeline:
     
     def _clear_existing_data(self, data: Any, store_key: str):
         """Clear existing data from tables before loading to avoid duplicates."""
-        from sqlalchemy import text
-        import polars as pl
+        if isinstance(data, dict):
+            # Multiple tables - clear in reverse order (to handle foreign keys)
+            table_names = [t for t in ['jobs_history', 'telephone_numbers', 'users'] if t in data]
+        else:
+            # Single table - determine table name
+            table_names = ['test' if store_key == 'csv_data' else store_key]
         
         try:
-            self.loader._ensure_engine()
-            with self.loader.engine.connect() as conn:
-                if isinstance(data, (pd.DataFrame, pl.DataFrame)):
-                    # Single table - determine table name
-                    table_name = 'test' if store_key == 'csv_data' else store_key
-                    try:
-                        conn.execute(text(f"TRUNCATE TABLE {table_name} CASCADE"))
-                        conn.commit()
-                        logger.info(f"Cleared existing data from table: {table_name}")
-                    except Exception:
-                        pass  # Table might not exist yet
-                elif isinstance(data, dict):
-                    # Multiple tables - clear in reverse order (to handle foreign keys)
-                    table_order = ['jobs_history', 'telephone_numbers', 'users']
-                    for table_name in table_order:
-                        if table_name in data:
-                            try:
-                                conn.execute(text(f"TRUNCATE TABLE {table_name} CASCADE"))
-                                logger.info(f"Cleared existing data from table: {table_name}")
-                            except Exception:
-                                pass  # Table might not exist yet
-                    conn.commit()
+            self.loader.clear(table_names)
+            logger.info(f"Cleared existing data from tables: {', '.join(table_names)}")
         except Exception as e:
             logger.warning(f"Could not clear existing data: {e}")
             # Continue anyway - the loader will handle duplicates
     
     def close(self):
-        self.loader.close()
+        self.csv_transformer.close()
+        if self._loader is not None:
+            self._loader.close()
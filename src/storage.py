@@ -1,72 +1,299 @@
+import fnmatch
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
 import polars as pl
-import pandas as pd
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+
+GENERATIONS_DIR = '.generations'
+# Generations younger than this are never removed, so slow readers and concurrent writers stay safe
+GENERATION_GRACE_SECONDS = 600
+KEEP_GENERATIONS = 3
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+# A directory listing is only reused once it was taken this long after the directory's last change;
+# directory mtimes are coarse, so an entry added in the same tick would otherwise go unnoticed
+INDEX_SETTLE_NS = 1_000_000_000
+
+# 'ipc' is uncompressed Arrow IPC (Feather v2): read_ipc memory-maps it instead of decoding
+READERS = {
+    'parquet': pl.read_parquet,
+    'csv': pl.read_csv,
+    'ipc': pl.read_ipc,
+}
+
+
+def is_pandas_frame(data: Any) -> bool:
+    # Avoid importing pandas just for an isinstance check: if it isn't loaded, data can't be a pandas frame
+    pd = sys.modules.get('pandas')
+    return pd is not None and isinstance(data, pd.DataFrame)
+
+
+def _fsync_dir(path: Path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # Directories can't be opened on some platforms (e.g. Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def _replace_atomic(path: Path, write):
+    """Stage `write(tmp_path)` in the target directory, then rename it over `path`."""
+    tmp = _temp_path(path)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+
+
+def write_atomic(df: pl.DataFrame, path: Path, format: str = 'parquet'):
+    """Write a DataFrame so readers see either the previous file or the complete new one."""
+    def write(tmp):
+        with open(tmp, 'wb') as f:
+            if format == 'parquet':
+                df.write_parquet(f)
+            elif format == 'ipc':
+                df.write_ipc(f, compression='uncompressed')
+            elif format == 'csv':
+                df.write_csv(f)
+            else:
+                raise ValueError(f"Unsupported format: {format}")
+            f.flush()
+            os.fsync(f.fileno())
+    _replace_atomic(Path(path), write)
+
+
+def write_json_atomic(content: dict, path: Path):
+    def write(tmp):
+        with open(tmp, 'w') as f:
+            json.dump(content, f)
+            f.flush()
+            os.fsync(f.fileno())
+    _replace_atomic(path, write)
+
+
+def link_atomic(source: Path, path: Path):
+    def write(tmp):
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copyfile(source, tmp)  # Filesystem without hard links
+    _replace_atomic(path, write)
+
+
+def _stamp(stat: os.stat_result) -> tuple:
+    # Atomic replaces always produce a new inode, so a rewrite is detected even within one mtime tick
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class ReadCache:
+    """LRU cache of decoded frames, keyed by path and invalidated when the file's stat changes.
+    
+    Holds at most `max_bytes` of frame data (by `estimated_size`); 0 disables caching.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, path: Path, stamp: tuple) -> Optional[pl.DataFrame]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != stamp:
+                if entry is not None:
+                    self._evict(path)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+            # Clones share the column buffers; in-place edits by the caller can't reach the cached frame
+            return entry[1].clone()
+    
+    def put(self, path: Path, stamp: tuple, df: pl.DataFrame):
+        size = df.estimated_size()
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if path in self._entries:
+                self._evict(path)
+            self._entries[path] = (stamp, df, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+    
+    def _evict(self, path: Path):
+        self.size -= self._entries.pop(path)[2]
 
 
 class ObjectStore:
-    def __init__(self, base_path: str):
+    """Parquet/CSV/Arrow IPC files under a base directory.
+    
+    Single tables are stored as `<key>.<format>`. Multi-table (dict) saves are written to an
+    immutable generation directory and committed together by atomically replacing
+    `<key>.manifest.json`; the flat `<key>_<table>.<format>` files are kept up to date for
+    existing readers. Every write is staged to a temp file, fsynced and renamed, so
+    concurrent readers and writers of different keys need no locking.
+    
+    Reads go through an in-process `ReadCache` (`cache_bytes`, 0 disables it), and the
+    directory listing and manifests are cached until the files change on disk.
+    """
+    
+    def __init__(self, base_path: str, cache_bytes: int = DEFAULT_CACHE_BYTES):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True, mode=0o755)
+        self.cache = ReadCache(cache_bytes)
+        self._index = None
+        self._manifests = {}
+    
+    def manifest_path(self, key: str) -> Path:
+        return self.base_path / f"{key}.manifest.json"
     
     def save(self, data: Any, key: str, format: str = 'parquet'):
-        if isinstance(data, pl.DataFrame):
-            path = self.base_path / f"{key}.{format}"
-            # Remove existing file if it exists and is not writable
-            if path.exists():
-                try:
-                    path.unlink()
-                except PermissionError:
-                    # If we can't delete, try to overwrite (may fail if owned by root)
-                    pass
-            if format == 'parquet':
-                data.write_parquet(path)
-            else:
-                data.write_csv(path)
-            return str(path)
-        elif isinstance(data, pd.DataFrame):
+        if is_pandas_frame(data):
             # Convert pandas to polars for faster I/O
-            df_pl = pl.from_pandas(data)
+            data = pl.from_pandas(data)
+        
+        if isinstance(data, pl.DataFrame):
             path = self.base_path / f"{key}.{format}"
-            if format == 'parquet':
-                df_pl.write_parquet(path)
-            else:
-                df_pl.write_csv(path)
+            write_atomic(data, path, format)
+            # A single-table save supersedes an earlier multi-table save under the same key
+            self.manifest_path(key).unlink(missing_ok=True)
             return str(path)
         
         if isinstance(data, dict):
-            for table_name, df in data.items():
-                path = self.base_path / f"{key}_{table_name}.{format}"
-                # Remove existing file if it exists
-                if path.exists():
-                    try:
-                        path.unlink()
-                    except PermissionError:
-                        pass
-                if isinstance(df, pl.DataFrame):
-                    if format == 'parquet':
-                        df.write_parquet(path)
-                    else:
-                        df.write_csv(path)
-                else:
-                    # Convert pandas to polars
-                    df_pl = pl.from_pandas(df)
-                    if format == 'parquet':
-                        df_pl.write_parquet(path)
-                    else:
-                        df_pl.write_csv(path)
+            return self._save_tables(data, key, format)
     
-    def load(self, key: str, format: str = 'parquet'):
+    def _save_tables(self, data: dict, key: str, format: str):
+        generation = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        generation_dir = self.base_path / GENERATIONS_DIR / key / generation
+        generation_dir.mkdir(parents=True)
+        
+        tables = {}
+        for table_name, df in data.items():
+            if is_pandas_frame(df):
+                df = pl.from_pandas(df)
+            path = generation_dir / f"{table_name}.{format}"
+            write_atomic(df, path, format)
+            tables[table_name] = str(path.relative_to(self.base_path))
+        
+        # Commit point: all tables become visible together
+        manifest = {'generation': generation, 'format': format, 'tables': tables}
+        write_json_atomic(manifest, self.manifest_path(key))
+        
+        for table_name, relative in tables.items():
+            link_atomic(self.base_path / relative, self.base_path / f"{key}_{table_name}.{format}")
+        
+        self._prune_generations(key)
+        return str(self.manifest_path(key))
+    
+    def _read_manifest(self, key: str):
+        path = self.manifest_path(key)
+        try:
+            with open(path) as f:
+                stamp = _stamp(os.fstat(f.fileno()))
+                cached = self._manifests.get(key)
+                if cached is not None and cached[0] == stamp:
+                    return cached[1]
+                manifest = json.load(f)
+        except FileNotFoundError:
+            self._manifests.pop(key, None)
+            return None
+        self._manifests[key] = (stamp, manifest)
+        return manifest
+    
+    def _listing(self) -> frozenset:
+        """Names in the base directory, re-read only when the directory has changed."""
+        mtime = self.base_path.stat().st_mtime_ns
+        if self._index is not None:
+            index_mtime, taken, names = self._index
+            if index_mtime == mtime and taken - mtime >= INDEX_SETTLE_NS:
+                return names
+        taken = time.time_ns()
+        names = frozenset(os.listdir(self.base_path))
+        self._index = (mtime, taken, names)
+        return names
+    
+    def _prune_generations(self, key: str):
+        manifest = self._read_manifest(key)
+        current = manifest['generation'] if manifest else None
+        cutoff = time.time() - GENERATION_GRACE_SECONDS
+        generations = sorted((self.base_path / GENERATIONS_DIR / key).iterdir())
+        for generation_dir in generations[:-KEEP_GENERATIONS]:
+            if generation_dir.name == current:
+                continue
+            try:
+                if generation_dir.stat().st_mtime > cutoff:
+                    continue
+                shutil.rmtree(generation_dir)
+            except FileNotFoundError:
+                continue  # Removed by a concurrent writer
+    
+    def delete(self, key: str, format: str = 'parquet'):
+        """Remove everything stored under a key. Missing files are ignored."""
+        manifest = self._read_manifest(key)
+        # Dropping the manifest first makes the multi-table save invisible in one step
+        self.manifest_path(key).unlink(missing_ok=True)
+        (self.base_path / f"{key}.{format}").unlink(missing_ok=True)
+        if manifest is not None:
+            for table_name in manifest['tables']:
+                (self.base_path / f"{key}_{table_name}.{manifest['format']}").unlink(missing_ok=True)
+        shutil.rmtree(self.base_path / GENERATIONS_DIR / key, ignore_errors=True)
+    
+    def locate(self, key: str, format: str = 'parquet'):
+        """Return the stored file path for a key, a {table_name: path} dict for multi-table keys, or None."""
+        manifest = self._read_manifest(key)
+        if manifest is not None and manifest.get('format') == format:
+            return {table_name: self.base_path / p for table_name, p in manifest['tables'].items()}
+        
         path = self.base_path / f"{key}.{format}"
         if path.exists():
-            return pl.read_parquet(path) if format == 'parquet' else pl.read_csv(path)
+            return path
         
-        paths = list(self.base_path.glob(f"{key}_*.{format}"))
+        pattern = f"{key}_*.{format}"
+        paths = [self.base_path / name for name in sorted(self._listing()) if fnmatch.fnmatchcase(name, pattern)]
         if not paths:
             return None
+        return {p.stem.replace(f"{key}_", ""): p for p in paths}
+    
+    def read(self, path: Path, format: str = 'parquet') -> pl.DataFrame:
+        """Read one stored file, reusing the cached frame while the file is unchanged."""
+        path = Path(path)
+        stamp = _stamp(path.stat())
+        df = self.cache.get(path, stamp)
+        if df is None:
+            df = READERS[format](path)
+            self.cache.put(path, stamp, df.clone())
+        return df
+    
+    def load(self, key: str, format: str = 'parquet'):
+        located = self.locate(key, format)
+        if located is None:
+            return None
         
-        result = {}
-        for p in paths:
-            table_name = p.stem.replace(f"{key}_", "")
-            result[table_name] = pl.read_parquet(p) if format == 'parquet' else pl.read_csv(p)
-        return result
+        if isinstance(located, Path):
+            return self.read(located, format)
+        return {table_name: self.read(p, format) for table_name, p in located.items()}
@@ -1,72 +1,144 @@
 import polars as pl
+from functools import partial
 from typing import List, Dict
-from .utils.pii_masking import mask_email, mask_phone, mask_national_id, mask_password, mask_address, mask_name
+from .utils.pii_masking import (
+    mask_email, mask_phone, mask_national_id, mask_password, mask_address, mask_name,
+    mask_name_expr, mask_address_expr
+)
 from .utils.transform_helpers import parse_timestamp, parse_date, to_boolean
+from .utils.normalize import (
+    parse_timestamp_expr, to_boolean_expr, string_to_boolean_expr, to_float_expr, to_currency_expr,
+    parse_timestamp_series, parse_date_series, to_boolean_series, normalize_values, FallbackPool
+)
+
+
+def _amount_expr(expr: pl.Expr) -> pl.Expr:
+    return to_float_expr(expr).round(2)
+
+
+def _currency_expr(expr: pl.Expr, pool: FallbackPool = None) -> pl.Expr:
+    return to_currency_expr(expr, pool).round(2)
+
+
+# Column rewrites applied when the column is present. All of them go into one with_columns,
+# so Polars evaluates the columns in parallel and builds the output frame once.
+CSV_COLUMN_PLAN = {
+    'created_at': parse_timestamp_expr,
+    'last_login': parse_timestamp_expr,  # Handles Unix timestamps and string dates
+    'is_claimed': to_boolean_expr,
+    'paid_amount': _amount_expr,
+    'name': mask_name_expr,
+    'address': mask_address_expr,
+}
+
+# Used instead of the CSV_COLUMN_PLAN entry when the column was read as Utf8: a native expression
+# Polars can run in parallel with the others, rather than a map_batches callback holding the GIL
+CSV_STRING_PLAN = {
+    'is_claimed': string_to_boolean_expr,
+}
 
 
 class CSVTransformer:
+    def __init__(self, parse_currency: bool = False, workers: int = 1):
+        # workers > 1 parses rows that need the scalar helpers in that many processes (see FallbackPool);
+        # they stay up across transforms until close()
+        self.pool = FallbackPool(workers)
+        self.column_plan = dict(CSV_COLUMN_PLAN)
+        self.column_plan['created_at'] = self.column_plan['last_login'] = partial(parse_timestamp_expr, pool=self.pool)
+        if parse_currency:
+            # Opt-in: accept amounts like '$1,234.50' (symbol and thousands separators) in paid_amount
+            self.column_plan['paid_amount'] = partial(_currency_expr, pool=self.pool)
+    
     def transform(self, data: pl.DataFrame):
-        df = data.clone()
-        
-        # Add ID column if missing
-        if 'id' not in df.columns:
-            df = df.with_columns(pl.int_range(1, df.height + 1).alias('id'))
-        
-        # Check and fix duplicates
-        if df['id'].is_duplicated().any():
-            df = df.with_columns(pl.int_range(1, df.height + 1).alias('id'))
-        
-        # Timestamp parsing with cleaning
-        if 'created_at' in df.columns:
-            df = df.with_columns(
-                pl.col('created_at')
-                .map_elements(parse_timestamp, return_dtype=pl.Datetime)
-                .alias('created_at')
-            )
-        
-        if 'last_login' in df.columns:
-            # Handle Unix timestamps and string dates using helper function
-            df = df.with_columns(
-                pl.col('last_login')
-                .map_elements(parse_timestamp, return_dtype=pl.Datetime)
-                .alias('last_login')
-            )
-        
-        # Boolean conversion
-        if 'is_claimed' in df.columns:
-            df = df.with_columns(
-                pl.col('is_claimed')
-                .map_elements(to_boolean, return_dtype=pl.Boolean)
-                .alias('is_claimed')
-            )
-        
-        if 'paid_amount' in df.columns:
-            df = df.with_columns(
-                pl.col('paid_amount').cast(pl.Float64, strict=False).round(2).alias('paid_amount')
-            )
-        
-        # PII masking
-        if 'name' in df.columns:
-            df = df.with_columns(
-                pl.col('name')
-                .map_elements(mask_name, return_dtype=pl.Utf8)
-                .alias('name')
-            )
+        return data.lazy().with_columns(self.plan(data)).collect()
+    
+    def close(self):
+        self.pool.close()
+    
+    def plan(self, data: pl.DataFrame) -> List[pl.Expr]:
+        """The column expressions `transform` evaluates in one with_columns."""
+        plan = []
         
-        if 'address' in df.columns:
-            df = df.with_columns(
-                pl.col('address')
-                .map_elements(mask_address, return_dtype=pl.Utf8)
-                .alias('address')
-            )
+        # Add ID column if missing, or renumber if there are duplicates
+        if 'id' not in data.columns or data['id'].is_duplicated().any():
+            plan.append(pl.int_range(1, pl.len() + 1).alias('id'))
         
-        return df
+        schema = data.schema
+        for name, build in self.column_plan.items():
+            if name in schema:
+                if schema[name] == pl.Utf8:
+                    build = CSV_STRING_PLAN.get(name, build)
+                plan.append(build(pl.col(name)).alias(name))
+        return plan
     
+# Raw JSON fields normalized column-wise after collection: (columnar twin, scalar helper, dtype)
+TIMESTAMP_COERCION = (parse_timestamp_series, parse_timestamp, pl.Datetime('us'))
+DATE_COERCION = (parse_date_series, parse_date, pl.Date)
+BOOLEAN_COERCION = (to_boolean_series, to_boolean, pl.Boolean)
+
+USER_COLUMNS = ['user_id', 'created_at', 'updated_at', 'logged_at', 'name', 'dob', 'address', 'username', 'password', 'national_id']
+USER_COERCIONS = {
+    'created_at': TIMESTAMP_COERCION,
+    'updated_at': TIMESTAMP_COERCION,
+    'logged_at': TIMESTAMP_COERCION,
+    'dob': DATE_COERCION,
+}
+
+JOB_COLUMNS = ['job_id', 'user_id', 'occupation', 'is_fulltime', 'start', 'end', 'employer']
+JOB_COERCIONS = {
+    'is_fulltime': BOOLEAN_COERCION,
+    'start': DATE_COERCION,
+    'end': DATE_COERCION,
+}
+
+
+# Raw values travel with their rows through dedup and filtering under this suffix, then are split off
+RAW_SUFFIX = '__raw'
+
+
+def _raw_text(value):
+    # JSON fields mix types; validation rules compare the text form ('true'/'false' for booleans)
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+def _build_frame(records: List[Dict], raw_values: Dict[str, list], coercions: Dict, columns: List[str]) -> pl.DataFrame:
+    if not records:
+        return pl.DataFrame(records)
+    normalized = [
+        normalize_values(raw_values[name], name, *coercions[name])
+        for name in coercions
+    ]
+    raw = [
+        pl.Series(f"{name}{RAW_SUFFIX}", [_raw_text(v) for v in raw_values[name]], dtype=pl.Utf8)
+        for name in coercions
+    ]
+    return pl.DataFrame(records).with_columns(normalized + raw).select(columns + [s.name for s in raw])
+
+
+def _split_raw(df: pl.DataFrame):
+    raw_columns = [c for c in df.columns if c.endswith(RAW_SUFFIX)]
+    raw = df.select(raw_columns).rename({c: c[:-len(RAW_SUFFIX)] for c in raw_columns})
+    return df.drop(raw_columns), raw
+
+
 class JSONTransformer:
     def transform(self, data: List[Dict]):
+        return self.transform_with_raw(data)[0]
+    
+    def transform_with_raw(self, data: List[Dict]):
+        """Transform records and also return, per table, the pre-coercion values of coerced columns.
+        
+        The raw frames are row-aligned with the transformed tables, for `JSONValidator`.
+        """
         users_data = []
         telephone_numbers_data = []
         jobs_history_data = []
+        users_raw = {name: [] for name in USER_COERCIONS}
+        jobs_raw = {name: [] for name in JOB_COERCIONS}
         
         for record in data:
             user_id = record.get('user_id')
@@ -77,17 +149,18 @@ class JSONTransformer:
             
             user_record = {
                 'user_id': user_id,
-                'created_at': parse_timestamp(record.get('created_at', None)),
-                'updated_at': parse_timestamp(record.get('updated_at', None)),
-                'logged_at': parse_timestamp(record.get('logged_at', None)),
                 'name': mask_name(user_details.get('name', None)),
-                'dob': parse_date(user_details.get('dob', None)),
                 'address': mask_address(user_details.get('address', None)),
                 'username': mask_email(user_details.get('username', None)),
                 'password': mask_password(user_details.get('password', None)),
                 'national_id': mask_national_id(user_details.get('national_id', None)),
             }
             users_data.append(user_record)
+            # Parsed in one columnar pass once all records are collected
+            users_raw['created_at'].append(record.get('created_at', None))
+            users_raw['updated_at'].append(record.get('updated_at', None))
+            users_raw['logged_at'].append(record.get('logged_at', None))
+            users_raw['dob'].append(user_details.get('dob', None))
             
             telephone_numbers = user_details.get('telephone_numbers', [])
             if isinstance(telephone_numbers, list):
@@ -104,16 +177,16 @@ class JSONTransformer:
                         'job_id': job.get('id', None),
                         'user_id': user_id,
                         'occupation': job.get('occupation', None),
-                        'is_fulltime': to_boolean(job.get('is_fulltime', None)),
-                        'start': parse_date(job.get('start', None)),
-                        'end': parse_date(job.get('end', None)),
                         'employer': job.get('employer', None)
                     })
+                    jobs_raw['is_fulltime'].append(job.get('is_fulltime', None))
+                    jobs_raw['start'].append(job.get('start', None))
+                    jobs_raw['end'].append(job.get('end', None))
         
         # Create DataFrames
-        users_df = pl.DataFrame(users_data)
+        users_df = _build_frame(users_data, users_raw, USER_COERCIONS, USER_COLUMNS)
         telephone_numbers_df = pl.DataFrame(telephone_numbers_data)
-        jobs_history_df = pl.DataFrame(jobs_history_data)
+        jobs_history_df = _build_frame(jobs_history_data, jobs_raw, JOB_COERCIONS, JOB_COLUMNS)
         
         # Remove duplicates based on user_id (keep the one with latest created_at)
         if not users_df.is_empty():
@@ -135,8 +208,12 @@ class JSONTransformer:
                 pl.col('user_id').is_in(valid_user_ids)
             )
         
-        return {
+        users_df, users_raw_df = _split_raw(users_df)
+        jobs_history_df, jobs_raw_df = _split_raw(jobs_history_df)
+        
+        tables = {
             'users': users_df,
             'telephone_numbers': telephone_numbers_df,
             'jobs_history': jobs_history_df
         }
+        return tables, {'users': users_raw_df, 'jobs_history': jobs_raw_df}
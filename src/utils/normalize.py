@@ -0,0 +1,240 @@
+"""Columnar twins of the scalar coercion helpers in transform_helpers.
+
+Each `*_series` function takes a whole column and returns the values the scalar
+helper would produce, row for row; the matching `*_expr` wraps it for use inside
+`with_columns`. Common inputs are handled with native Polars string/temporal
+kernels; only rows the vectorized path cannot resolve fall back to the scalar
+helper, so edge cases (e.g. dateutil parsing) keep their exact semantics while
+the bulk of a column never enters Python. Functions that fall back take an
+optional `FallbackPool` to spread large fallbacks over worker processes.
+"""
+import os
+import re
+import time
+import polars as pl
+from functools import partial
+from zoneinfo import ZoneInfo
+from .transform_helpers import (
+    TRUE_VALUES, FALSE_VALUES, TRUE_PREFIX, FALSE_PREFIX,
+    MAX_UNIX_TIMESTAMP, TIMESTAMP_FORMATS, CURRENCY_SYMBOLS, THOUSANDS_PATTERN,
+    parse_timestamp, parse_date, to_boolean, to_float, to_currency,
+)
+
+# Lookahead-free equivalents of the patterns in _clean_timestamp_string (Polars regex has no lookaround)
+_TRAILING_DATE_SUFFIX = r'([0-9]{4}-[0-9]{2}-[0-9]{2})[^0-9\s:-]\S*$'
+_TRAILING_DATETIME_SUFFIX = r'([0-9]{4}-[0-9]{2}-[0-9]{2}\s+[0-9]{2}:[0-9]{2}:[0-9]{2})[^0-9\s:-]\S*$'
+
+_BOOLEAN_LOOKUP = {**{v: True for v in TRUE_VALUES}, **{v: False for v in FALSE_VALUES}}
+
+DATETIME = pl.Datetime('us')
+
+# Scalar fallbacks over at least this many rows go to worker processes; threads would hold the GIL
+FALLBACK_POOL_ROWS = 10_000
+FALLBACK_CHUNK_ROWS = 2_000
+
+
+def local_timezone():
+    """IANA name of the process timezone, used to match datetime.fromtimestamp. None if unknown."""
+    candidates = [os.environ.get('TZ', '').lstrip(':')]
+    localtime = os.path.realpath('/etc/localtime')
+    if 'zoneinfo/' in localtime:
+        candidates.append(localtime.split('zoneinfo/', 1)[1])
+    for name in candidates:
+        if not name:
+            continue
+        try:
+            ZoneInfo(name)
+            return name
+        except Exception:
+            continue
+    if not os.environ.get('TZ') and time.timezone == 0 and not time.daylight:
+        return 'UTC'
+    return None
+
+
+LOCAL_TIMEZONE = local_timezone()
+
+
+def _is_string(s: pl.Series) -> bool:
+    return s.dtype == pl.Utf8
+
+
+def _is_number(s: pl.Series) -> bool:
+    return s.dtype.is_numeric()
+
+
+def _nulls(name: str, length: int, dtype) -> pl.Series:
+    return pl.Series(name, dtype=dtype).extend_constant(None, length)
+
+
+class FallbackPool:
+    """Worker processes for scalar fallbacks over many rows; disabled with `workers` <= 1.
+
+    Workers start on first use with the spawn method, which re-imports the main module in
+    each of them, so a script using more than one worker needs an `if __name__ == '__main__':`
+    guard. The owner calls `close()` to stop them.
+    """
+
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self._executor = None
+
+    def map(self, func, values: list) -> list:
+        if self.workers < 2 or len(values) < FALLBACK_POOL_ROWS:
+            return [func(v) for v in values]
+        from concurrent.futures.process import BrokenProcessPool
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn, not fork: forking after Polars has started its thread pool can deadlock the child
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            return list(self._executor.map(func, values, chunksize=FALLBACK_CHUNK_ROWS))
+        except BrokenProcessPool as e:
+            self.close()
+            raise RuntimeError(
+                "Fallback worker processes failed; the main module must be guarded by "
+                "`if __name__ == '__main__':` when using more than one worker"
+            ) from e
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def _with_fallback(result: pl.Series, source: pl.Series, func, pool: FallbackPool = None) -> pl.Series:
+    """Run the scalar helper only on rows the vectorized path left null."""
+    residual = result.is_null() & source.is_not_null()
+    if not residual.any():
+        return result
+    values = source.filter(residual).to_list()
+    fixed = pool.map(func, values) if pool is not None else [func(v) for v in values]
+    return result.scatter(residual.arg_true(), pl.Series(fixed, dtype=result.dtype))
+
+
+def _from_unix(seconds: pl.Series) -> pl.Series:
+    """Whole seconds in [0, MAX_UNIX_TIMESTAMP] to naive local time; anything else is left null."""
+    if LOCAL_TIMEZONE is None:
+        return _nulls(seconds.name, len(seconds), DATETIME)
+    in_range = seconds.is_between(0, MAX_UNIX_TIMESTAMP) & (seconds == seconds.floor())
+    return pl.select(
+        pl.from_epoch(pl.when(pl.lit(in_range)).then(pl.lit(seconds)).cast(pl.Int64), time_unit='s')
+        .dt.replace_time_zone('UTC')
+        .dt.convert_time_zone(LOCAL_TIMEZONE)
+        .dt.replace_time_zone(None)
+        .cast(DATETIME)
+    ).to_series().alias(seconds.name)
+
+
+def clean_timestamp_series(s: pl.Series) -> pl.Series:
+    return (
+        s.str.strip_chars()
+        .str.replace(_TRAILING_DATE_SUFFIX, '${1}')
+        .str.replace(_TRAILING_DATETIME_SUFFIX, '${1}')
+        .str.strip_chars()
+    )
+
+
+def parse_timestamp_series(s: pl.Series, pool: FallbackPool = None) -> pl.Series:
+    if _is_string(s):
+        stripped = s.str.strip_chars()
+        result = _from_unix(stripped.cast(pl.Float64, strict=False))
+        cleaned = clean_timestamp_series(stripped)
+        # Formats are tried in order, like the scalar helper; each pass only fills rows still null
+        for fmt in TIMESTAMP_FORMATS:
+            if not (result.is_null() & cleaned.is_not_null()).any():
+                break
+            result = result.fill_null(cleaned.str.strptime(DATETIME, fmt, strict=False))
+    elif _is_number(s) and s.dtype != pl.Boolean:
+        result = _from_unix(s.cast(pl.Float64))
+    else:
+        result = _nulls(s.name, len(s), DATETIME)
+    return _with_fallback(result, s, parse_timestamp, pool)
+
+
+def parse_date_series(s: pl.Series, pool: FallbackPool = None) -> pl.Series:
+    if not _is_string(s):
+        # parse_date only accepts strings
+        return _with_fallback(_nulls(s.name, len(s), pl.Date), s, parse_date, pool)
+    return parse_timestamp_series(s, pool).dt.date()
+
+
+def to_boolean_series(s: pl.Series) -> pl.Series:
+    if s.dtype == pl.Boolean:
+        return s.fill_null(False)
+    if _is_number(s):
+        return (s != 0).fill_null(False)
+    if not _is_string(s):
+        return pl.Series(s.name, [to_boolean(v) for v in s.to_list()], dtype=pl.Boolean)
+
+    return pl.select(string_to_boolean_expr(pl.lit(s))).to_series().alias(s.name)
+
+
+def to_float_series(s: pl.Series) -> pl.Series:
+    if _is_number(s):
+        return s.cast(pl.Float64)
+    if not _is_string(s):
+        return pl.Series(s.name, [to_float(v) for v in s.to_list()], dtype=pl.Float64)
+    # to_float accepts exactly what the cast accepts, so nothing is left for a scalar fallback
+    return s.str.strip_chars().cast(pl.Float64, strict=False)
+
+
+def to_currency_series(s: pl.Series, pool: FallbackPool = None) -> pl.Series:
+    if not _is_string(s):
+        return to_float_series(s)
+    value = s.str.strip_chars().str.replace(f"^[{re.escape(CURRENCY_SYMBOLS)}]\\s*", '')
+    has_comma = value.str.contains(',', literal=True)
+    result = pl.select(
+        pl.when(pl.lit(has_comma) & ~pl.lit(value).str.contains(THOUSANDS_PATTERN))
+        .then(None)
+        .otherwise(pl.lit(value).str.replace_all(',', '', literal=True).cast(pl.Float64, strict=False))
+    ).to_series().alias(s.name)
+    return _with_fallback(result, s, to_currency, pool)
+
+
+def parse_timestamp_expr(expr: pl.Expr, pool: FallbackPool = None) -> pl.Expr:
+    return expr.map_batches(partial(parse_timestamp_series, pool=pool), return_dtype=DATETIME)
+
+
+def parse_date_expr(expr: pl.Expr, pool: FallbackPool = None) -> pl.Expr:
+    return expr.map_batches(partial(parse_date_series, pool=pool), return_dtype=pl.Date)
+
+
+def to_boolean_expr(expr: pl.Expr) -> pl.Expr:
+    return expr.map_batches(to_boolean_series, return_dtype=pl.Boolean)
+
+
+def string_to_boolean_expr(expr: pl.Expr) -> pl.Expr:
+    """`to_boolean` for a Utf8 column as a native expression, with no Python callback."""
+    value = expr.str.strip_chars().str.to_lowercase()
+    return (
+        pl.when(expr.is_null()).then(False)
+        .when(value.is_in(list(_BOOLEAN_LOOKUP))).then(
+            value.replace_strict(_BOOLEAN_LOOKUP, default=None, return_dtype=pl.Boolean)
+        )
+        .when(value.str.starts_with(TRUE_PREFIX)).then(True)
+        .when(value.str.starts_with(FALSE_PREFIX)).then(False)
+        # bool(value) fallback: any other non-empty string is truthy
+        .otherwise(True)
+    )
+
+
+def to_float_expr(expr: pl.Expr) -> pl.Expr:
+    return expr.map_batches(to_float_series, return_dtype=pl.Float64)
+
+
+def to_currency_expr(expr: pl.Expr, pool: FallbackPool = None) -> pl.Expr:
+    return expr.map_batches(partial(to_currency_series, pool=pool), return_dtype=pl.Float64)
+
+
+def normalize_values(values: list, name: str, series_func, scalar_func, return_dtype) -> pl.Series:
+    """Apply a columnar twin to a list of raw Python values.
+
+    Lists with a single scalar type are built into a typed Series and normalized in one
+    pass; mixed-type lists (e.g. JSON fields holding both ints and strings) use the scalar helper.
+    """
+    types = {type(v) for v in values if v is not None}
+    if len(types) <= 1 and types <= {str, int, float, bool}:
+        return series_func(pl.Series(name, values)).cast(return_dtype).alias(name)
+    return pl.Series(name, [scalar_func(v) for v in values], dtype=return_dtype)
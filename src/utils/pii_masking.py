@@ -1,4 +1,5 @@
 import re
+import polars as pl
 
 
 def mask_email(email):
@@ -61,3 +62,40 @@ def mask_name(name):
     elif len(parts) == 1:
         return f"{parts[0][0]}***"
     return "***"
+
+
+# Whitespace as str.split() sees it: Unicode White_Space plus the \x1c-\x1f separators
+_SPACE = r'\s\x1c-\x1f'
+
+
+def _stars(expr: pl.Expr) -> pl.Expr:
+    return pl.lit('').str.pad_start(expr.str.len_chars(), '*')
+
+
+def _unmasked(expr: pl.Expr) -> pl.Expr:
+    # The scalar helpers return null and empty strings unchanged
+    return expr.is_null() | (expr == '')
+
+
+def mask_name_expr(expr: pl.Expr) -> pl.Expr:
+    """Columnar equivalent of mask_name."""
+    first = expr.str.extract(rf'^[{_SPACE}]*([^{_SPACE}])', 1)
+    last = expr.str.extract(rf'([^{_SPACE}])[^{_SPACE}]*[{_SPACE}]*$', 1)
+    several = expr.str.contains(rf'[^{_SPACE}][{_SPACE}]+[^{_SPACE}]')
+    return (
+        pl.when(_unmasked(expr)).then(expr)
+        .when(first.is_null()).then(pl.lit('***'))
+        .when(several).then(pl.concat_str([first, pl.lit('*** '), last, pl.lit('***')]))
+        .otherwise(pl.concat_str([first, pl.lit('***')]))
+    )
+
+
+def mask_address_expr(expr: pl.Expr) -> pl.Expr:
+    """Columnar equivalent of mask_address: lines after the second are dropped, as in the scalar helper."""
+    parts = expr.str.split_exact('\n', 1)
+    street, city_state = parts.struct.field('field_0'), parts.struct.field('field_1')
+    return (
+        pl.when(_unmasked(expr)).then(expr)
+        .when(city_state.is_not_null()).then(pl.concat_str([_stars(street), pl.lit('\n'), city_state]))
+        .otherwise(_stars(expr))
+    )
@@ -0,0 +1,130 @@
+"""Opt-in profiling of pipeline stages.
+
+With PIPELINE_PROFILE=1 (or `main.py --profile`) every stage wrapped in `StageProfiler.stage`
+writes to `<LOG_DIR>/profiles/<run>/`:
+    NN_<stage>.prof        cProfile stats (pstats, snakeviz)
+    NN_<stage>.alloc.txt   tracemalloc allocations that grew during the stage
+    NN_<stage>.collapsed   sampled stacks in collapsed format (flamegraph.pl, speedscope)
+tracemalloc only sees Python allocations; memory allocated inside Polars/Arrow is not traced.
+When profiling is off, `stage` returns a shared no-op context manager.
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from .logger import setup_logger
+
+logger = setup_logger()
+
+SAMPLE_INTERVAL = 0.005
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATIONS = 25
+
+_DISABLED = nullcontext()
+
+
+def profiling_enabled() -> bool:
+    return os.getenv('PIPELINE_PROFILE', '').lower() in ('1', 'true', 'yes')
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread and counts identical stacks."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                key = ';'.join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def collapsed(self) -> str:
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+
+class StageProfiler:
+    def __init__(self, output_dir: str = None, enabled: bool = None):
+        self.enabled = profiling_enabled() if enabled is None else enabled
+        self.output_dir = Path(output_dir or os.path.join(os.getenv('LOG_DIR', './logs'), 'profiles'))
+        self._run_dir = None
+        self._count = 0
+        self._active = False
+
+    @property
+    def run_dir(self) -> Path:
+        if self._run_dir is None:
+            self._run_dir = self.output_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+            self._run_dir.mkdir(parents=True, exist_ok=True)
+        return self._run_dir
+
+    def stage(self, name: str):
+        """Context manager that profiles the enclosed block as stage `name`."""
+        if not self.enabled or self._active:
+            return _DISABLED  # Disabled, or nested inside a stage that is already profiled
+        return self._profile(name)
+
+    @contextmanager
+    def _profile(self, name: str):
+        import cProfile
+        import tracemalloc
+
+        self._active = True
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        sampler = StackSampler(threading.get_ident())
+        profile = cProfile.Profile()
+
+        sampler.start()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            sampler.stop()
+            after = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            self._active = False
+            self._write(name, profile, after.compare_to(before, 'lineno'), sampler, elapsed, peak)
+
+    def _write(self, name: str, profile, allocations: list, sampler: StackSampler, elapsed: float, peak: int):
+        self._count += 1
+        base = self.run_dir / f"{self._count:02d}_{name}"
+        profile.dump_stats(f"{base}.prof")
+        Path(f"{base}.collapsed").write_text(sampler.collapsed())
+
+        lines = [f"Stage {name}: {elapsed:.3f}s, peak traced memory {peak / (1024 * 1024):.1f} MiB", '']
+        lines += [str(stat) for stat in allocations[:TOP_ALLOCATIONS]]
+        Path(f"{base}.alloc.txt").write_text('\n'.join(lines) + '\n')
+
+        logger.info(f"Profiled stage {name} in {elapsed:.3f}s (peak traced {peak / (1024 * 1024):.1f} MiB): {base}.*")
@@ -1,6 +1,30 @@
 import re
 from datetime import datetime
 
+TRUE_VALUES = ('true', '1', 'yes', 't', 'y', 'on')
+FALSE_VALUES = ('false', '0', 'no', 'f', 'n', 'off', '')
+TRUE_PREFIX = 'tru'
+FALSE_PREFIX = 'fals'
+
+# Jan 1, 1970 to Jan 1, 2100
+MAX_UNIX_TIMESTAMP = 4102444800
+
+TIMESTAMP_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%A, %B %d, %Y',
+    '%A, %B %dth, %Y',
+    '%A, %B %dst, %Y',
+    '%A, %B %dnd, %Y',
+    '%A, %B %drd, %Y',
+]
+
+CURRENCY_SYMBOLS = '$€£¥'
+# Whitespace to str.strip but not to Polars' strip_chars
+INFORMATION_SEPARATORS = '\x1c\x1d\x1e\x1f'
+# Commas are only accepted as thousands separators: '1,234.50', not '12,50' or '1,5'
+THOUSANDS_PATTERN = r'^[+-]?[0-9]{1,3}(,[0-9]{3})+(\.[0-9]+)?$'
+
 
 def _clean_timestamp_string(value):
     if not isinstance(value, str):
@@ -34,7 +58,7 @@ def parse_timestamp(value):
         try:
             numeric_value = float(value)
             # If it's a reasonable Unix timestamp (between 1970 and 2100)
-            if 0 <= numeric_value <= 4102444800:  # Jan 1, 1970 to Jan 1, 2100
+            if 0 <= numeric_value <= MAX_UNIX_TIMESTAMP:
                 return datetime.fromtimestamp(numeric_value)
         except (ValueError, OverflowError, OSError):
             pass
@@ -43,16 +67,7 @@ def parse_timestamp(value):
         value = _clean_timestamp_string(value)
         
         # Try common datetime formats
-        formats = [
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d',
-            '%A, %B %d, %Y',
-            '%A, %B %dth, %Y',
-            '%A, %B %dst, %Y',
-            '%A, %B %dnd, %Y',
-            '%A, %B %drd, %Y',
-        ]
-        for fmt in formats:
+        for fmt in TIMESTAMP_FORMATS:
             try:
                 return datetime.strptime(value, fmt)
             except:
@@ -87,22 +102,51 @@ def to_boolean(value):
         value_lower = value.lower().strip()
         
         # Exact matches for common true values
-        if value_lower in ('true', '1', 'yes', 't', 'y', 'on'):
+        if value_lower in TRUE_VALUES:
             return True
         
         # Exact matches for common false values
-        if value_lower in ('false', '0', 'no', 'f', 'n', 'off', ''):
+        if value_lower in FALSE_VALUES:
             return False
         
         # Handle typos: if string starts with 'tru' (like 'truee', 'tru', 'ture'), treat as True
-        if value_lower.startswith('tru'):
+        if value_lower.startswith(TRUE_PREFIX):
             return True
         
         # Handle typos: if string starts with 'fals' (like 'falsee', 'fals'), treat as False
-        if value_lower.startswith('fals'):
+        if value_lower.startswith(FALSE_PREFIX):
             return False
         
         return bool(value)
     return bool(value)
 
 
+def to_float(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        # Accept the same strings as Polars' Float64 cast: float() alone also takes digit-group
+        # underscores ('1_000'), non-ASCII digits and the \x1c-\x1f separators as whitespace
+        if '_' in value or any(c in value for c in INFORMATION_SEPARATORS):
+            return None
+        value = value.strip()
+        if not value.isascii():
+            return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def to_currency(value):
+    # Strips a leading currency symbol and thousands separators: '$1,234.50' -> 1234.5.
+    # Any other comma or inner whitespace makes the amount invalid (None) rather than being dropped.
+    if isinstance(value, str):
+        value = value.strip()
+        if value and value[0] in CURRENCY_SYMBOLS:
+            value = value[1:].lstrip()
+        if ',' in value:
+            if not re.match(THOUSANDS_PATTERN, value):
+                return None
+            value = value.replace(',', '')
+    return to_float(value)
@@ -0,0 +1,178 @@
+import polars as pl
+from typing import Dict, List, Optional, Tuple
+from .utils.transform_helpers import TRUE_VALUES, FALSE_VALUES, TRUE_PREFIX, FALSE_PREFIX
+
+RAW_SUFFIX = '__raw'
+REASON_COLUMN = 'quarantine_reason'
+
+
+def raw(column: str) -> pl.Expr:
+    """Reference the pre-transform value of a column."""
+    return pl.col(f"{column}{RAW_SUFFIX}")
+
+
+def _raw_present(column: str) -> pl.Expr:
+    value = raw(column).cast(pl.Utf8).str.strip_chars()
+    return value.is_not_null() & (value != '')
+
+
+class Rule:
+    """A declarative validation rule.
+
+    `failed` is a Polars expression that evaluates to True for rows breaking the rule.
+    `columns` lists every column the expression reads; the rule is skipped when any is missing.
+    """
+
+    def __init__(self, column: str, reason: str, failed: pl.Expr, columns: List[str]):
+        self.column = column
+        self.reason = reason
+        self.failed = failed
+        self.columns = columns
+
+    @property
+    def name(self) -> str:
+        return f"{self.column}:{self.reason}"
+
+
+def unparseable(column: str, reason: str) -> Rule:
+    """Raw value was present but the transformed value came out null."""
+    return Rule(
+        column, reason,
+        _raw_present(column) & pl.col(column).is_null(),
+        [column, f"{column}{RAW_SUFFIX}"]
+    )
+
+
+def unrecognized_boolean(column: str) -> Rule:
+    """Raw value is not one of the tokens `to_boolean` knows (it would silently become True)."""
+    value = raw(column).cast(pl.Utf8).str.strip_chars().str.to_lowercase()
+    known = (
+        value.is_in(TRUE_VALUES + FALSE_VALUES)
+        | value.str.starts_with(TRUE_PREFIX)
+        | value.str.starts_with(FALSE_PREFIX)
+    )
+    return Rule(
+        column, 'invalid_boolean',
+        value.is_not_null() & ~known,
+        [f"{column}{RAW_SUFFIX}"]
+    )
+
+
+def required(column: str) -> Rule:
+    return Rule(column, 'missing_value', pl.col(column).is_null(), [column])
+
+
+CSV_RULES = [
+    unparseable('created_at', 'invalid_timestamp'),
+    unparseable('last_login', 'invalid_timestamp'),
+    unrecognized_boolean('is_claimed'),
+    unparseable('paid_amount', 'invalid_amount'),
+]
+
+JSON_RULES = {
+    'users': [
+        unparseable('created_at', 'invalid_timestamp'),
+        unparseable('updated_at', 'invalid_timestamp'),
+        unparseable('logged_at', 'invalid_timestamp'),
+        unparseable('dob', 'invalid_date'),
+    ],
+    'telephone_numbers': [required('telephone_number')],
+    'jobs_history': [
+        required('job_id'),
+        unparseable('start', 'invalid_date'),
+        unparseable('end', 'invalid_date'),
+        unrecognized_boolean('is_fulltime'),
+    ],
+}
+
+# Child tables referencing users.user_id; their rows follow a quarantined user so loads never break the foreign key
+USER_CHILD_TABLES = ('telephone_numbers', 'jobs_history')
+
+
+def parent_quarantined(user_ids: pl.Series) -> Rule:
+    return Rule('user_id', 'quarantined_user', ~pl.col('user_id').is_in(user_ids.implode()), ['user_id'])
+
+
+class Validator:
+    """Evaluates a set of rules over a table in a single columnar pass.
+
+    Rows failing any rule are split off into a quarantine frame carrying a
+    `quarantine_reason` column (semicolon-separated rule names) and the raw
+    values the rules looked at.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+
+    def validate(self, df: pl.DataFrame, raw_df: Optional[pl.DataFrame] = None) -> Tuple[pl.DataFrame, pl.DataFrame, Dict[str, int]]:
+        frame = df
+        raw_columns = []
+        if raw_df is not None:
+            if raw_df.height != df.height:
+                raise ValueError(f"Raw frame has {raw_df.height} rows, expected {df.height}")
+            raw_columns = [f"{c}{RAW_SUFFIX}" for c in raw_df.columns]
+            frame = df.hstack(raw_df.rename(dict(zip(raw_df.columns, raw_columns))).get_columns())
+
+        rules = [r for r in self.rules if all(c in frame.columns for c in r.columns)]
+        if not rules:
+            return df, df.clear().with_columns(pl.lit(None, dtype=pl.Utf8).alias(REASON_COLUMN)), {}
+
+        names = [r.name for r in rules]
+        flagged = frame.with_columns([r.failed.fill_null(False).alias(r.name) for r in rules])
+        counts = flagged.select([pl.col(n).sum() for n in names]).row(0, named=True)
+
+        is_bad = pl.any_horizontal([pl.col(n) for n in names])
+        reason = pl.concat_str(
+            [pl.when(pl.col(n)).then(pl.lit(n)) for n in names],
+            separator=';',
+            ignore_nulls=True
+        )
+        # Keep only the raw values the rules inspected, so unmasked PII never reaches quarantine
+        inspected = [c for c in raw_columns if any(c in r.columns for r in rules)]
+
+        clean = flagged.filter(~is_bad).select(df.columns)
+        quarantined = (
+            flagged.filter(is_bad)
+            .with_columns(reason.alias(REASON_COLUMN))
+            .select(df.columns + inspected + [REASON_COLUMN])
+        )
+        return clean, quarantined, {n: int(c) for n, c in counts.items()}
+
+
+class CSVValidator:
+    def __init__(self, rules: Optional[List[Rule]] = None):
+        self.validator = Validator(CSV_RULES if rules is None else rules)
+
+    def validate(self, data: pl.DataFrame, raw_data: Optional[pl.DataFrame] = None):
+        return self.validator.validate(data, raw_data)
+
+
+class JSONValidator:
+    def __init__(self, rules: Optional[Dict[str, List[Rule]]] = None):
+        rules = JSON_RULES if rules is None else rules
+        self.validators = {table: Validator(table_rules) for table, table_rules in rules.items()}
+
+    def validate(self, data: Dict[str, pl.DataFrame], raw_data: Optional[Dict[str, pl.DataFrame]] = None):
+        """Validate each table; `raw_data` holds row-aligned pre-coercion values per table
+        (see `JSONTransformer.transform_with_raw`)."""
+        raw_data = raw_data or {}
+        clean = {}
+        quarantined = {}
+        counts = {}
+        # Users first, so child rows of quarantined users can follow them
+        ordered = sorted(data, key=lambda name: name != 'users')
+        for table_name in ordered:
+            df = data[table_name]
+            validator = self.validators.get(table_name)
+            if validator is not None and table_name in USER_CHILD_TABLES and 'users' in quarantined:
+                if not quarantined['users'].is_empty() and 'user_id' in df.columns:
+                    validator = Validator(validator.rules + [parent_quarantined(clean['users']['user_id'])])
+            if validator is None or df.is_empty():
+                clean[table_name] = df
+                continue
+            raw_df = raw_data.get(table_name)
+            if raw_df is not None and raw_df.width == 0:
+                raw_df = None
+            clean[table_name], quarantined[table_name], table_counts = validator.validate(df, raw_df)
+            counts.update({f"{table_name}.{name}": count for name, count in table_counts.items()})
+        return {name: clean[name] for name in data}, quarantined, counts
@@ -0,0 +1,183 @@
+import json
+import os
+import signal
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+JOB_MODES = ('csv', 'json')
+# Claimed jobs not finished within this time are requeued, whichever host claimed them
+STALE_AFTER_SECONDS = 3600
+
+
+def _host() -> str:
+    # Dots would be ambiguous with the claim file's separators
+    return socket.gethostname().replace('.', '_')
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+def _write_result(directory: Path, name: str, content: str) -> Path:
+    """Write a job result without overwriting the result of an earlier job with the same name."""
+    path = directory / name
+    while True:
+        try:
+            with open(path, 'x') as f:
+                f.write(content)
+            return path
+        except FileExistsError:
+            path = directory / f"{Path(name).stem}.{time.time_ns()}.json"
+
+
+class Worker:
+    """Long-running worker that processes job descriptors dropped into a spool directory.
+
+    A job is a `*.json` file such as `{"mode": "csv", "file": "test.csv", "store_key": "csv_data"}`
+    (optionally with `"store_only": true`). Jobs are claimed by renaming them to
+    `<name>.<host>-<pid>.processing`, so several workers can share one spool directory; claims
+    left by a dead worker on this host, or older than `stale_after` seconds, are requeued.
+    Finished jobs are moved to `done/` or `failed/` together with their status and latency.
+    The same `Pipeline` (and its database connection pool) is reused for every job.
+    """
+
+    def __init__(self, spool_dir: str, pipeline=None, poll_interval: float = 1.0,
+                 stale_after: float = STALE_AFTER_SECONDS):
+        self.spool_dir = Path(spool_dir)
+        self.done_dir = self.spool_dir / 'done'
+        self.failed_dir = self.spool_dir / 'failed'
+        for path in (self.spool_dir, self.done_dir, self.failed_dir):
+            path.mkdir(parents=True, exist_ok=True)
+
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.owner = f"{_host()}-{os.getpid()}"
+        self._pipeline = pipeline
+        self._stop_event = threading.Event()
+
+    @property
+    def pipeline(self):
+        if self._pipeline is None:
+            from .pipeline import Pipeline
+            self._pipeline = Pipeline()
+        return self._pipeline
+
+    def stop(self, signum=None, frame=None):
+        """Finish the job in progress, then exit the run loop."""
+        if signum is not None:
+            logger.info(f"Received signal {signum}, shutting down after current job")
+        self._stop_event.set()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop_event.is_set()
+
+    def run(self):
+        previous = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        logger.info(f"Worker watching spool directory: {self.spool_dir}")
+        try:
+            while not self.stopping:
+                if not self.run_once():
+                    self._stop_event.wait(self.poll_interval)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+            if self._pipeline is not None:
+                self._pipeline.close()
+            logger.info("Worker stopped")
+
+    def run_once(self) -> int:
+        """Process every job currently in the spool directory. Returns the number processed."""
+        self.requeue_stale()
+        processed = 0
+        for job_path in sorted(self.spool_dir.glob('*.json')):
+            if self.stopping:
+                break
+            claimed = self._claim(job_path)
+            if claimed is None:
+                continue
+            self._run_job(claimed, job_path.name)
+            processed += 1
+        return processed
+
+    def _claim(self, job_path: Path) -> Optional[Path]:
+        claimed = job_path.with_name(f"{job_path.stem}.{self.owner}.processing")
+        try:
+            job_path.rename(claimed)
+        except FileNotFoundError:
+            return None  # Claimed by another worker
+        claimed.touch()  # rename keeps the job's mtime; staleness counts from the claim
+        return claimed
+
+    def requeue_stale(self) -> int:
+        """Move claims abandoned by crashed workers back into the queue. Returns the number requeued."""
+        requeued = 0
+        host = _host()
+        for claimed in self.spool_dir.glob('*.processing'):
+            name, _, owner = claimed.stem.rpartition('.')
+            owner_host, _, pid = owner.rpartition('-')
+            try:
+                if owner_host == host and pid.isdigit():
+                    stale = not _process_alive(int(pid))
+                else:
+                    stale = time.time() - claimed.stat().st_mtime > self.stale_after
+                if stale:
+                    claimed.rename(self.spool_dir / f"{name}.json")
+            except FileNotFoundError:
+                continue  # Finished or requeued by another worker
+            if stale:
+                logger.warning(f"Requeued job {name}.json abandoned by {owner}")
+                requeued += 1
+        return requeued
+
+    def _run_job(self, claimed: Path, name: str):
+        start = time.perf_counter()
+        result = {'status': 'done', 'error': None}
+        try:
+            job = json.loads(claimed.read_text())
+            result['job'] = job
+            result['status'] = self.process(job)
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = str(e)
+        result['latency_ms'] = round((time.perf_counter() - start) * 1000, 3)
+
+        target_dir = self.failed_dir if result['status'] == 'failed' else self.done_dir
+        _write_result(target_dir, name, json.dumps(result, default=str))
+        claimed.unlink()
+
+        if result['status'] == 'failed':
+            logger.error(f"Job {name} failed after {result['latency_ms']} ms: {result['error']}")
+        else:
+            logger.info(f"Job {name} {result['status']} in {result['latency_ms']} ms")
+
+    def process(self, job: dict) -> str:
+        mode = job.get('mode')
+        if mode not in JOB_MODES:
+            raise ValueError(f"Invalid job mode: {mode}. Expected one of {JOB_MODES}")
+        if not job.get('file') or not job.get('store_key'):
+            raise ValueError("Job must define 'file' and 'store_key'")
+
+        load = not job.get('store_only', False)
+        try:
+            if mode == 'csv':
+                self.pipeline.process_csv(job['file'], load=load, store_key=job['store_key'])
+            else:
+                self.pipeline.process_json(job['file'], load=load, store_key=job['store_key'])
+        except ConnectionError as e:
+            # Data is already in the object store; only the database load failed
+            logger.error(f"Database load failed for {job['store_key']}: {e}")
+            return 'stored'
+        return 'done'
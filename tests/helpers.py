@@ -0,0 +1,36 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from src.loaders import SQLLoader
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+requires_duckdb = unittest.skipIf(duckdb is None, "duckdb not installed")
+
+
+class EmbeddedDatabaseTest:
+    """Mixin giving each test an `SQLLoader` on a fresh `db_type` ('sqlite' or 'duckdb') database
+    in `self.tmp`, and `query` to read it back."""
+
+    db_type = None
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, f"etl.{self.db_type}")
+        with mock.patch.dict(os.environ, {'DB_TYPE': self.db_type, 'DB_PATH': self.db_path}):
+            self.loader = SQLLoader()
+
+    def tearDown(self):
+        self.loader.close()
+        self.tmp.cleanup()
+
+    def query(self, sql):
+        if self.db_type == 'duckdb':
+            return self.loader.backend.conn.execute(sql).fetchall()
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql).fetchall()
@@ -0,0 +1,157 @@
+import os
+import tempfile
+import unittest
+import polars as pl
+from src.cdc import ChangeTracker, compute_delta, OP_COLUMN
+from src.storage import ObjectStore
+from tests.helpers import EmbeddedDatabaseTest, requires_duckdb
+
+
+def users(rows):
+    return pl.DataFrame(rows, schema={'user_id': pl.Utf8, 'name': pl.Utf8}, orient='row')
+
+
+class TestComputeDelta(unittest.TestCase):
+    def test_insert_update_delete(self):
+        previous = users([('1', 'A'), ('2', 'B'), ('3', 'C')])
+        current = users([('1', 'A'), ('2', 'B2'), ('4', 'D')])
+
+        delta = compute_delta(previous, current, ['user_id']).sort('user_id')
+
+        self.assertEqual(delta['user_id'].to_list(), ['2', '3', '4'])
+        self.assertEqual(delta[OP_COLUMN].to_list(), ['update', 'delete', 'insert'])
+        self.assertEqual(delta['name'].to_list(), ['B2', 'C', 'D'])
+
+    def test_null_values_are_not_changes(self):
+        previous = pl.DataFrame({'user_id': ['1'], 'telephone_number': [None]}, schema={'user_id': pl.Utf8, 'telephone_number': pl.Utf8})
+
+        delta = compute_delta(previous, previous.clone(), previous.columns)
+
+        self.assertTrue(delta.is_empty())
+
+    def test_matches_on_key_columns(self):
+        previous = pl.DataFrame({'a': ['1', None], 'b': ['x', 'y'], 'v': [1, 2]})
+        current = pl.DataFrame({'a': ['1', None, '2'], 'b': ['x', 'y', 'x'], 'v': [1, 3, 4]})
+
+        delta = compute_delta(previous, current, ['a', 'b'])
+
+        self.assertEqual(delta.select('a', 'v', OP_COLUMN).rows(), [('2', 4, 'insert'), (None, 3, 'update')])
+
+    def test_added_column_counts_as_update(self):
+        previous = users([('1', 'A')])
+        current = previous.with_columns(pl.lit('x').alias('extra'))
+
+        delta = compute_delta(previous, current, ['user_id'])
+
+        self.assertEqual(delta[OP_COLUMN].to_list(), ['update'])
+
+
+class TestChangeTracker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tracker = ChangeTracker(ObjectStore(self.tmp.name), keep_versions=2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_versions_and_deltas(self):
+        first = self.tracker.track('json_data', {'users': users([('1', 'A')])})
+        second = self.tracker.track('json_data', {'users': users([('1', 'A2'), ('2', 'B')])})
+
+        self.assertEqual(first['users']['version'], 1)
+        self.assertEqual(first['users']['inserted'], 1)
+        self.assertEqual(second['users']['version'], 2)
+        self.assertEqual((second['users']['inserted'], second['users']['updated']), (1, 1))
+        self.assertEqual(pl.read_parquet(second['users']['path']).height, 2)
+
+    def test_snapshot_links_stored_file(self):
+        store = ObjectStore(self.tmp.name)
+        df = users([('1', 'A')])
+        store.save({'users': df}, 'json_data')
+
+        change = self.tracker.track('json_data', {'users': df}, store.locate('json_data'))['users']
+
+        snapshot = self.tracker.snapshot_path(change['name'], change['version'])
+        self.assertTrue(os.path.samefile(snapshot, store.locate('json_data')['users']))
+
+    def test_pending_deltas_since_applied_version(self):
+        destination = 'sqlite:/tmp/etl.sqlite'
+        first = self.tracker.track('csv_data', users([('1', 'A')]).rename({'user_id': 'id'}))
+        self.assertIsNone(self.tracker.pending('csv_data', first, destination))
+
+        self.tracker.mark_applied('csv_data', destination, first)
+        self.tracker.track('csv_data', users([('1', 'B')]).rename({'user_id': 'id'}))
+        third = self.tracker.track('csv_data', users([('1', 'C')]).rename({'user_id': 'id'}))
+
+        pending = self.tracker.pending('csv_data', third, destination)
+        self.assertEqual(pending[None]['paths'], [self.tracker.delta_path('csv_data', v) for v in (2, 3)])
+        self.assertEqual(self.tracker.pending('csv_data', third, 'sqlite:/tmp/other.sqlite'), None)
+
+        self.tracker.mark_applied('csv_data', destination, third)
+        self.assertEqual(self.tracker.pending('csv_data', third, destination), {})
+
+    def test_pending_needs_full_load_once_deltas_are_pruned(self):
+        destination = 'sqlite:/tmp/etl.sqlite'
+        self.tracker.mark_applied('csv_data', destination, self.tracker.track('csv_data', users([('1', 'A')]).rename({'user_id': 'id'})))
+        for name in ('B', 'C', 'D'):
+            latest = self.tracker.track('csv_data', users([('1', name)]).rename({'user_id': 'id'}))
+
+        self.assertIsNone(self.tracker.pending('csv_data', latest, destination))
+
+    def test_prunes_old_versions(self):
+        for name in ('A', 'B', 'C'):
+            self.tracker.track('csv_data', users([('1', name)]).rename({'user_id': 'id'}))
+
+        self.assertEqual(self.tracker.versions('csv_data'), [2, 3])
+        self.assertFalse(self.tracker.delta_path('csv_data', 1).exists())
+
+
+class ApplyChangesTest(EmbeddedDatabaseTest):
+    def setUp(self):
+        super().setUp()
+        self.tracker = ChangeTracker(ObjectStore(os.path.join(self.tmp.name, 'store')))
+
+    def tables(self, names, phones):
+        return {
+            'users': users(names),
+            'telephone_numbers': pl.DataFrame({'user_id': [p[0] for p in phones], 'telephone_number': [p[1] for p in phones]}),
+        }
+
+    def test_apply_successive_deltas(self):
+        self.loader.apply_changes(self.tracker.track('json_data', self.tables([('1', 'A'), ('2', 'B')], [('1', '*11'), ('2', '*22')])))
+        self.loader.apply_changes(self.tracker.track('json_data', self.tables([('1', 'A2'), ('3', 'C')], [('1', '*11'), ('3', '*33')])))
+
+        self.assertEqual(self.query("SELECT user_id, name FROM users ORDER BY user_id"), [('1', 'A2'), ('3', 'C')])
+        self.assertEqual(
+            self.query("SELECT user_id, telephone_number FROM telephone_numbers ORDER BY user_id"),
+            [('1', '*11'), ('3', '*33')]
+        )
+
+    def test_apply_several_deltas_at_once(self):
+        destination = self.loader.destination
+        first = self.tracker.track('json_data', self.tables([('1', 'A'), ('2', 'B')], [('1', '*11'), ('2', '*22')]))
+        self.loader.apply_changes(first)
+        self.tracker.mark_applied('json_data', destination, first)
+        self.tracker.track('json_data', self.tables([('1', 'A'), ('2', 'B'), ('3', 'C')], [('1', '*11'), ('3', '*33')]))
+        latest = self.tracker.track('json_data', self.tables([('1', 'A2')], [('1', '*11'), ('1', '*22')]))
+
+        self.loader.apply_changes(self.tracker.pending('json_data', latest, destination))
+
+        self.assertEqual(self.query("SELECT user_id, name FROM users ORDER BY user_id"), [('1', 'A2')])
+        self.assertEqual(
+            self.query("SELECT user_id, telephone_number FROM telephone_numbers ORDER BY user_id"),
+            [('1', '*11'), ('1', '*22')]
+        )
+
+
+class TestSQLiteApplyChanges(ApplyChangesTest, unittest.TestCase):
+    db_type = 'sqlite'
+
+
+@requires_duckdb
+class TestDuckDBApplyChanges(ApplyChangesTest, unittest.TestCase):
+    db_type = 'duckdb'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import polars as pl
+from src.backends import PostgresBackend, iter_parquet
+from src.governor import MemoryGovernor, MIN_BATCH_ROWS, MEMORY_OVERHEAD
+
+# Memory ceiling that fits exactly 1024 rows of one Int64 column
+LIMIT_1024_INT_ROWS = 1024 * 8 * MEMORY_OVERHEAD
+
+
+class TestMemoryGovernor(unittest.TestCase):
+    def test_batch_size_capped_by_memory_limit(self):
+        governor = MemoryGovernor(memory_limit=100 * 1024 * 1024)
+        governor.measure(nbytes=1000 * 100, rows=100)
+        governor.observe(rows=10_000_000, seconds=1)
+
+        self.assertEqual(governor.batch_rows(), 100 * 1024 * 1024 // (1000 * MEMORY_OVERHEAD))
+
+    def test_batch_size_follows_throughput(self):
+        governor = MemoryGovernor(target_seconds=0.5)
+        governor.observe(rows=20000, seconds=1)
+        self.assertEqual(governor.batch_rows(), 10000)
+
+        governor.observe(rows=10, seconds=1)
+        self.assertLess(governor.batch_rows(), 10000)
+        for _ in range(10):
+            governor.observe(rows=10, seconds=1)
+        self.assertEqual(governor.batch_rows(), MIN_BATCH_ROWS)
+
+    def test_memory_limit_wins_over_minimum_batch(self):
+        governor = MemoryGovernor(memory_limit=16 * 1024 * 1024)
+        governor.measure(nbytes=20_000 * 10, rows=10)
+
+        self.assertLess(governor.batch_rows(), MIN_BATCH_ROWS)
+        self.assertLessEqual(governor.batch_rows() * 20_000 * MEMORY_OVERHEAD, governor.memory_limit)
+
+    def test_split_covers_every_row(self):
+        governor = MemoryGovernor(memory_limit=LIMIT_1024_INT_ROWS)
+        df = pl.DataFrame({'v': range(5000)})
+
+        slices = list(governor.split(df))
+
+        self.assertEqual([s.height for s in slices], [1024, 1024, 1024, 1024, 904])
+        self.assertEqual(pl.concat(slices)['v'].to_list(), list(range(5000)))
+
+    def test_commit_interval(self):
+        self.assertTrue(MemoryGovernor(commit_rows=100).should_commit(100))
+        self.assertFalse(MemoryGovernor(commit_rows=100).should_commit(99))
+        self.assertFalse(MemoryGovernor(commit_rows=0).should_commit(10 ** 9))
+
+    def test_parquet_regrouped_into_governed_batches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'data.parquet'
+            pl.DataFrame({'v': range(50000)}).write_parquet(path)
+            governor = MemoryGovernor(memory_limit=LIMIT_1024_INT_ROWS)
+
+            batches = list(iter_parquet(path, governor=governor))
+
+        self.assertTrue(all(df.estimated_size() * MEMORY_OVERHEAD <= governor.memory_limit for df in batches))
+        self.assertEqual(pl.concat(batches)['v'].to_list(), list(range(50000)))
+
+    def test_wide_rows_read_within_memory_limit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'wide.parquet'
+            pl.DataFrame({'v': [f"{i:020000d}" for i in range(3000)]}).write_parquet(path, compression='uncompressed')
+            governor = MemoryGovernor(memory_limit=16 * 1024 * 1024)
+
+            batches = list(iter_parquet(path, governor=governor))
+
+        self.assertLessEqual(max(df.estimated_size() for df in batches) * MEMORY_OVERHEAD, governor.memory_limit)
+        self.assertEqual(sum(df.height for df in batches), 3000)
+
+
+class TestPostgresCopyBatches(unittest.TestCase):
+    def test_copies_in_batches_and_commits_at_interval(self):
+        backend = PostgresBackend('postgresql://unused', MemoryGovernor(memory_limit=LIMIT_1024_INT_ROWS, commit_rows=2048))
+        backend.engine = mock.Mock()
+        raw_conn = backend.engine.raw_connection.return_value
+        cursor = raw_conn.cursor.return_value
+
+        backend.insert(pl.DataFrame({'v': range(5000)}), 'test')
+
+        self.assertEqual(cursor.copy_expert.call_count, 5)
+        # Two interval commits (after 2048 and 4096 rows) plus the final one
+        self.assertEqual(raw_conn.commit.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
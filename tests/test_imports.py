@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ('pandas', 'sqlalchemy', 'psycopg2')
+# Cumulative import time allowed for our own code, excluding polars itself (about 5x the measured time)
+IMPORT_BUDGET_US = 250_000
+
+
+def import_times(statement: str) -> dict:
+    """Run `statement` under `python -X importtime` and return {module: cumulative_us}."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=str(ROOT), OBJECT_STORE_PATH=tmp)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', statement],
+            cwd=tmp, env=env, capture_output=True, text=True, check=True
+        )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def assert_no_heavy_imports(self, statement: str):
+        times = import_times(statement)
+        loaded = [m for m in times if m.split('.')[0] in HEAVY_MODULES]
+        self.assertEqual(loaded, [], f"{statement!r} pulled in DB modules")
+
+    def test_main_imports_no_heavy_modules(self):
+        self.assert_no_heavy_imports('import main')
+
+    def test_pipeline_imports_no_heavy_modules(self):
+        self.assert_no_heavy_imports('import src.pipeline')
+
+    def assert_within_budget(self, statement: str, module: str):
+        times = import_times(statement)
+        own = times[module] - times.get('polars', 0)
+        self.assertLess(own, IMPORT_BUDGET_US, f"{statement!r} took {own / 1000:.0f} ms excluding polars")
+
+    def test_main_import_time(self):
+        self.assert_within_budget('import main', 'main')
+
+    def test_pipeline_import_time(self):
+        self.assert_within_budget('import src.pipeline', 'src.pipeline')
+
+    def test_store_only_run_imports_no_heavy_modules(self):
+        self.assert_no_heavy_imports(
+            'from src.pipeline import Pipeline; '
+            'import polars as pl; '
+            'Pipeline().object_store.save(pl.DataFrame({"id": [1]}), "importtime_probe")'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import unittest
+from datetime import date, datetime
+from unittest import mock
+import polars as pl
+from src.backends import CSVBatchStream
+from src.loaders import SQLLoader
+from src.storage import ObjectStore
+from tests.helpers import EmbeddedDatabaseTest, requires_duckdb
+
+
+def json_tables():
+    return {
+        'users': pl.DataFrame({
+            'user_id': ['1', '2'],
+            'created_at': [datetime(2020, 1, 1), None],
+            'dob': [date(1990, 1, 1), None],
+        }),
+        'telephone_numbers': pl.DataFrame({'user_id': ['1', '1'], 'telephone_number': ['***1234', '***5678']}),
+        'jobs_history': pl.DataFrame({'job_id': ['a'], 'user_id': ['2'], 'is_fulltime': [True], 'end': [date(2021, 1, 1)]}),
+    }
+
+
+class EmbeddedLoaderTest(EmbeddedDatabaseTest):
+    def test_load_tables_with_shared_ddl(self):
+        self.loader.load(json_tables(), 'json_data')
+
+        self.assertEqual(self.query("SELECT COUNT(*) FROM users"), [(2,)])
+        self.assertEqual(self.query("SELECT id FROM telephone_numbers ORDER BY id"), [(1,), (2,)])
+        self.assertEqual(self.query('SELECT "end" FROM jobs_history')[0][0], self.expected_date)
+
+    def test_clear_then_reload(self):
+        self.loader.load(json_tables(), 'json_data')
+        self.loader.clear(['jobs_history', 'telephone_numbers', 'users'])
+        self.loader.load(json_tables(), 'json_data')
+
+        self.assertEqual(self.query("SELECT COUNT(*) FROM users"), [(2,)])
+
+    def test_load_parquet_from_store(self):
+        store = ObjectStore(os.path.join(self.tmp.name, 'store'))
+        store.save(json_tables(), 'json_data')
+        store.save(pl.DataFrame({'id': [1, 2, 3]}), 'csv_data')
+
+        self.loader.load_parquet(store.locate('json_data'), 'json_data')
+        self.loader.load_parquet(store.locate('csv_data'), 'test')
+
+        self.assertEqual(self.query("SELECT COUNT(*) FROM users"), [(2,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM telephone_numbers"), [(2,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM test"), [(3,)])
+
+    def test_load_single_table(self):
+        df = pl.DataFrame({'id': [1, 2], 'is_claimed': [True, False], 'paid_amount': [1.5, None]})
+        self.loader.load(df, 'test')
+
+        self.assertEqual(self.query("SELECT COUNT(*) FROM test WHERE paid_amount IS NULL"), [(1,)])
+
+
+class TestSQLiteLoader(EmbeddedLoaderTest, unittest.TestCase):
+    db_type = 'sqlite'
+    expected_date = '2021-01-01'
+
+
+@requires_duckdb
+class TestDuckDBLoader(EmbeddedLoaderTest, unittest.TestCase):
+    db_type = 'duckdb'
+    expected_date = date(2021, 1, 1)
+
+
+class TestCSVBatchStream(unittest.TestCase):
+    def test_streams_batches_in_order(self):
+        batches = [pl.DataFrame({'a': [1, None]}), pl.DataFrame({'a': [3]})]
+        stream = CSVBatchStream(batches, '\\N')
+
+        chunks = []
+        while True:
+            chunk = stream.read(3)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        self.assertEqual(b''.join(chunks), b'1\n\\N\n3\n')
+
+
+class TestSQLLoaderConfig(unittest.TestCase):
+    def test_unsupported_db_type(self):
+        with mock.patch.dict(os.environ, {'DB_TYPE': 'oracle'}):
+            with self.assertRaises(ValueError):
+                SQLLoader()
+
+    def test_postgres_requires_credentials(self):
+        with mock.patch.dict(os.environ, {'DB_TYPE': 'postgresql', 'DB_HOST': ''}):
+            with self.assertRaises(ValueError):
+                SQLLoader()
+
+
+if __name__ == '__main__':
+    unittest.main()
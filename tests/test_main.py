@@ -0,0 +1,48 @@
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import main
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = Path(self.tmp.name) / 'data'
+        self.data.mkdir()
+        self.db_path = os.path.join(self.tmp.name, 'etl.sqlite')
+        (self.data / 'a.json').write_text(json.dumps([
+            {'user_id': '1', 'created_at': '2020-01-01', 'user_details': {'name': 'John Doe'}, 'jobs_history': []},
+        ]))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_main(self, *args, **env):
+        env = {
+            'DATA_PATH': str(self.data),
+            'OBJECT_STORE_PATH': os.path.join(self.tmp.name, 'output'),
+            'DB_PATH': self.db_path,
+            **env,
+        }
+        argv = ['main.py', '--mode', 'json', '--file', 'a.json', '--store-key', 'json_data', *args]
+        with mock.patch.dict(os.environ, env), mock.patch.object(sys, 'argv', argv):
+            main.main()
+            return os.environ['DB_TYPE']
+
+    def test_db_type_from_environment(self):
+        self.assertEqual(self.run_main(DB_TYPE='sqlite'), 'sqlite')
+
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT user_id FROM users").fetchall(), [('1',)])
+
+    def test_db_type_flag_overrides_environment(self):
+        self.assertEqual(self.run_main('--db-type', 'sqlite', '--store-only', DB_TYPE='duckdb'), 'sqlite')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from unittest import mock
+import polars as pl
+from src.utils import normalize
+from src.utils.normalize import (
+    parse_timestamp_series, parse_date_series, to_boolean_series,
+    to_float_series, to_currency_series, to_boolean_expr, string_to_boolean_expr, normalize_values, FallbackPool
+)
+from src.utils.transform_helpers import parse_timestamp, parse_date, to_boolean, to_float, to_currency
+
+TIMESTAMP_STRINGS = [
+    '2020-01-01', '2020-01-01 10:30:45', '  2020-01-02  ', '1986-06-23TEST', '2021-12-25 10:30:45EXTRA',
+    '1577836800', '1577836800.5', '99999999999', '-5', 'Wednesday, January 01, 2020',
+    'Wednesday, January 1st, 2020', 'Monday, January 1st, 2020', 'Jan 5 2020', 'not a date', '', None,
+]
+BOOLEAN_STRINGS = [
+    'True', 'false', ' YES ', 'n', 'On', 'off', '', '  ', 'truee', 'ture', 'Falsee', 'fals', 'garbage', '0', '1', None,
+]
+NUMBER_STRINGS = [
+    '5004.67', ' 893.40 ', '1e3', '1_000', '١٢', '１２', '\x1c7\x1c', '\xa07', 'nan', '-inf', 'abc', '', '-0.5', None,
+]
+CURRENCY_STRINGS = [
+    '$1,234.50', '€ 12', '£0.99', '1 000', 'USD 5', '$', '12,50', '1,5', '1 2 3', '-1,234,567.8', '1,23,456', ',123', None,
+]
+
+
+def apply(series_func, values, dtype=None):
+    return series_func(pl.Series('v', values, dtype=dtype)).to_list()
+
+
+def same(a, b):
+    # NaN-aware equality for float results
+    return a == b or (a != a and b != b)
+
+
+class TestColumnarTwins(unittest.TestCase):
+    def assert_equivalent(self, series_func, scalar_func, values, dtype=None):
+        vectorized = apply(series_func, values, dtype)
+        expected = [scalar_func(v) for v in values]
+        for value, got, want in zip(values, vectorized, expected):
+            self.assertTrue(same(got, want), f"{value!r}: columnar {got!r} != scalar {want!r}")
+
+    def test_parse_timestamp_strings(self):
+        self.assert_equivalent(parse_timestamp_series, parse_timestamp, TIMESTAMP_STRINGS)
+
+    def test_parse_timestamp_numbers(self):
+        self.assert_equivalent(parse_timestamp_series, parse_timestamp, [1577836800, 0, -5, None])
+        self.assert_equivalent(parse_timestamp_series, parse_timestamp, [1577836800.25, 1e12, None])
+
+    def test_parse_date(self):
+        self.assert_equivalent(parse_date_series, parse_date, TIMESTAMP_STRINGS)
+        self.assert_equivalent(parse_date_series, parse_date, [1577836800, None])
+
+    def test_to_boolean(self):
+        self.assert_equivalent(to_boolean_series, to_boolean, BOOLEAN_STRINGS)
+        self.assert_equivalent(to_boolean_series, to_boolean, [True, False, None])
+        self.assert_equivalent(to_boolean_series, to_boolean, [0, 1, 2, None])
+        self.assert_equivalent(to_boolean_series, to_boolean, [None, None], dtype=pl.Null)
+
+    def test_to_float(self):
+        self.assert_equivalent(to_float_series, to_float, NUMBER_STRINGS)
+        self.assert_equivalent(to_float_series, to_float, [1, 2, None])
+
+    def test_to_float_rejects_what_the_cast_rejects(self):
+        self.assertEqual(apply(to_float_series, ['1_000', '١٢', '\x1c7', ' 7 ']), [None, None, None, 7.0])
+        self.assertEqual([to_float(v) for v in ['1_000', '١٢', '\x1c7', ' 7 ']], [None, None, None, 7.0])
+
+    def test_to_currency(self):
+        self.assert_equivalent(to_currency_series, to_currency, CURRENCY_STRINGS + NUMBER_STRINGS)
+
+    def test_to_currency_rejects_non_thousands_commas(self):
+        self.assertEqual(
+            apply(to_currency_series, ['$1,234.50', '12,50', '1,5', '1 2 3']),
+            [1234.5, None, None, None]
+        )
+
+    def test_normalize_values_mixed_types(self):
+        values = ['2020-01-01', 1577836800, None]
+        result = normalize_values(values, 'v', parse_timestamp_series, parse_timestamp, pl.Datetime('us'))
+        self.assertEqual(result.to_list(), [parse_timestamp(v) for v in values])
+
+    def test_expression_wrapper(self):
+        df = pl.DataFrame({'v': ['True', 'fals', None]})
+        self.assertEqual(df.select(to_boolean_expr(pl.col('v')))['v'].to_list(), [True, False, False])
+
+    def test_string_boolean_expression(self):
+        df = pl.DataFrame({'v': BOOLEAN_STRINGS})
+        self.assertEqual(df.select(string_to_boolean_expr(pl.col('v')).alias('v'))['v'].to_list(), [to_boolean(v) for v in BOOLEAN_STRINGS])
+
+    def test_large_fallback_uses_worker_processes(self):
+        values = TIMESTAMP_STRINGS * 4
+        pool = FallbackPool(workers=2)
+        self.addCleanup(pool.close)
+        with mock.patch.object(normalize, 'FALLBACK_POOL_ROWS', 8):
+            result = parse_timestamp_series(pl.Series('v', values), pool).to_list()
+        self.assertIsNotNone(pool._executor)
+        self.assertEqual(result, [parse_timestamp(v) for v in values])
+
+        pool.close()
+        self.assertIsNone(pool._executor)
+
+    def test_fallback_pool_is_off_by_default(self):
+        pool = FallbackPool()
+        with mock.patch.object(normalize, 'FALLBACK_POOL_ROWS', 1):
+            self.assertEqual(pool.map(str, [1, 2]), ['1', '2'])
+        self.assertIsNone(pool._executor)
+
+    def test_normalize_values_single_type(self):
+        values = ['yes', 'no', None]
+        result = normalize_values(values, 'v', to_boolean_series, to_boolean, pl.Boolean)
+        self.assertEqual(result.to_list(), [True, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
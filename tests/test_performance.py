@@ -0,0 +1,200 @@
+"""Throughput and memory regression benchmarks.
+
+Run with `pytest -m performance` (or `make perf`); they are deselected by default.
+Each benchmark runs in a fresh process on a generated dataset of fixed size and is checked
+against `performance_baseline.json`: rows/sec must stay above `min_rows_per_sec` and the peak
+RSS of the measured section below `max_peak_rss_mb`. The Postgres load benchmark replaces the
+contents of the `test` table and fails unless DB_HOST/DB_PORT point at a reachable server
+(`make perf` starts one with `make db-up` and `. ./setup.sh`).
+"""
+import json
+import multiprocessing
+import os
+import re
+import resource
+import socket
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import pytest
+
+pytestmark = pytest.mark.performance
+
+BASELINE_PATH = Path(__file__).with_name('performance_baseline.json')
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak-RSS counter (Linux only). Returns False if unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb(reset: bool) -> float:
+    if reset:
+        with open('/proc/self/status') as f:
+            return int(re.search(r'VmHWM:\s+(\d+)', f.read()).group(1)) / 1024
+    # Process-lifetime peak; KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def cycle(values, n):
+    return [values[i % len(values)] for i in range(n)]
+
+
+def csv_frame(n):
+    import polars as pl
+    return pl.DataFrame({
+        'id': list(range(1, n + 1)),
+        'name': cycle(['John Smith', 'Maria Garcia', 'Li Wei', 'Amina Yusuf'], n),
+        'address': cycle(['12 High Street, London', '5 Rue de Rivoli, Paris', '9 Main St, Springfield'], n),
+        'color': cycle(['red', 'green', 'blue'], n),
+        'created_at': cycle(['2021-03-04 10:15:00', '2020-12-31', '2019-07-01T08:00:00'], n),
+        'last_login': cycle(['1609459200', '2022-01-01 00:00:00', '1577836800'], n),
+        'is_claimed': cycle(['True', 'false', 'yes', '0'], n),
+        'paid_amount': cycle(['1234.50', '893.40', '12.00'], n),
+    })
+
+
+def json_records(n):
+    return [{
+        'user_id': str(i),
+        'created_at': '2020-01-01T00:00:00',
+        'updated_at': '2020-06-01 12:00:00',
+        'logged_at': 1577836800 + i,
+        'user_details': {
+            'name': 'John Doe',
+            'dob': '1990-01-01',
+            'address': '12 High Street, London',
+            'username': f'user{i}@example.com',
+            'password': 'secret',
+            'national_id': '123456789',
+            'telephone_numbers': ['123-456-7890', '098-765-4321'],
+        },
+        'jobs_history': [{
+            'id': f'job{i}',
+            'occupation': 'Engineer',
+            'is_fulltime': 'yes',
+            'start': '2020-01-01',
+            'end': '2021-01-01',
+            'employer': 'Acme',
+        }],
+    } for i in range(n)]
+
+
+def bench_csv_transform(n, tmp):
+    from src.transformers import CSVTransformer
+    data = csv_frame(n)
+    return lambda: CSVTransformer().transform(data)
+
+
+def bench_json_transform(n, tmp):
+    from src.transformers import JSONTransformer
+    data = json_records(n)
+    return lambda: JSONTransformer().transform(data)
+
+
+def bench_object_store_round_trip(n, tmp):
+    from src.storage import ObjectStore
+    from src.transformers import JSONTransformer
+    tables = JSONTransformer().transform(json_records(n))
+    store = ObjectStore(tmp, cache_bytes=0)
+
+    def run():
+        store.save(tables, 'json_data')
+        return store.load('json_data')
+    return run
+
+
+def bench_postgres_load(n, tmp):
+    from src.loaders import SQLLoader
+    from src.storage import ObjectStore
+    from src.transformers import CSVTransformer
+    store = ObjectStore(tmp)
+    store.save(CSVTransformer().transform(csv_frame(n)), 'csv_data')
+    path = store.locate('csv_data')
+    os.environ['DB_TYPE'] = 'postgresql'
+    loader = SQLLoader()
+
+    def run():
+        loader.clear(['test'])
+        loader.load_parquet(path, 'test')
+        loader.close()
+    return run
+
+
+BENCHMARKS = {
+    'csv_transform': bench_csv_transform,
+    'json_transform': bench_json_transform,
+    'object_store_round_trip': bench_object_store_round_trip,
+    'postgres_load': bench_postgres_load,
+}
+
+
+def run_benchmark(name: str, rows: int) -> dict:
+    """Set up and time one benchmark; runs in a child process so memory readings are its own."""
+    with tempfile.TemporaryDirectory() as tmp:
+        run = BENCHMARKS[name](rows, tmp)
+        reset = reset_peak_rss()
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+        return {'rows_per_sec': rows / seconds, 'peak_rss_mb': peak_rss_mb(reset), 'seconds': seconds}
+
+
+def postgres_available() -> bool:
+    host, port = os.getenv('DB_HOST'), os.getenv('DB_PORT')
+    if not host or not port:
+        return False
+    try:
+        socket.create_connection((host, int(port)), timeout=1).close()
+        return True
+    except OSError:
+        return False
+
+
+class TestPerformance(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.baseline = json.loads(BASELINE_PATH.read_text())
+
+    def check(self, name):
+        budget = self.baseline[name]
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            result = pool.submit(run_benchmark, name, budget['rows']).result()
+
+        summary = (
+            f"{name}: {budget['rows']} rows in {result['seconds']:.2f}s "
+            f"({result['rows_per_sec']:.0f} rows/s, peak RSS {result['peak_rss_mb']:.0f} MB)"
+        )
+        print(summary)
+        self.assertGreaterEqual(result['rows_per_sec'], budget['min_rows_per_sec'], summary)
+        self.assertLessEqual(result['peak_rss_mb'], budget['max_peak_rss_mb'], summary)
+
+    def test_csv_transform(self):
+        self.check('csv_transform')
+
+    def test_json_transform(self):
+        self.check('json_transform')
+
+    def test_object_store_round_trip(self):
+        self.check('object_store_round_trip')
+
+    def test_postgres_load(self):
+        self.assertTrue(
+            postgres_available(),
+            f"PostgreSQL not reachable at DB_HOST={os.getenv('DB_HOST')} DB_PORT={os.getenv('DB_PORT')}; "
+            f"run `make perf`, or `make db-up` and `. ./setup.sh` first"
+        )
+        self.check('postgres_load')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,19 @@
 import unittest
+import polars as pl
 from src.utils.pii_masking import (
     mask_email, mask_phone, mask_national_id,
-    mask_address, mask_password
+    mask_address, mask_password, mask_name,
+    mask_name_expr, mask_address_expr
 )
 
+NAMES = [
+    'John Smith', '  john   q  public ', 'Madonna', '', '   ', None,
+    'Élodie\tÑúñez', 'a\x1cb', 'x\u3000y', 'John\nSmith\n',
+]
+ADDRESSES = [
+    '123 Main St\nCity, State 12345', 'single line', '', None, 'a\nb\nc', '\n', 'line\r\nnext', 'ünï\ncödé', 'trailing\n',
+]
+
 
 class TestPIIMasking(unittest.TestCase):
     def test_mask_email(self):
@@ -30,5 +40,18 @@ class TestPIIMasking(unittest.TestCase):
         self.assertTrue(result.startswith("*"))
 
 
+class TestColumnarMasks(unittest.TestCase):
+    def assert_equivalent(self, expr_func, scalar_func, values):
+        result = pl.DataFrame({'v': values}, schema={'v': pl.Utf8}).select(expr_func(pl.col('v')))['v'].to_list()
+        for value, got in zip(values, result):
+            self.assertEqual(got, scalar_func(value), f"{value!r}")
+
+    def test_mask_name(self):
+        self.assert_equivalent(mask_name_expr, mask_name, NAMES)
+
+    def test_mask_address(self):
+        self.assert_equivalent(mask_address_expr, mask_address, ADDRESSES)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import polars as pl
+from src.pipeline import Pipeline
+
+
+class TestPipelineQuarantine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = Path(self.tmp.name) / 'data'
+        self.data.mkdir()
+        env = {'DATA_PATH': str(self.data), 'OBJECT_STORE_PATH': os.path.join(self.tmp.name, 'output')}
+        with mock.patch.dict(os.environ, env):
+            self.pipeline = Pipeline()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_csv(self, created_at):
+        pl.DataFrame({'id': [1, 2], 'created_at': ['2020-01-01', created_at]}).write_csv(self.data / 'test.csv')
+        self.pipeline.process_csv('test.csv', load=False, store_key='csv_data')
+
+    def test_clean_run_removes_previous_quarantine(self):
+        self.run_csv('not a date')
+        self.assertIsNotNone(self.pipeline.quarantine_store.locate('csv_data'))
+
+        self.run_csv('2020-01-02')
+
+        self.assertIsNone(self.pipeline.quarantine_store.locate('csv_data'))
+
+
+class TestPipelineIncrementalLoad(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = Path(self.tmp.name) / 'data'
+        self.data.mkdir()
+        self.db_path = os.path.join(self.tmp.name, 'etl.sqlite')
+        env = {
+            'DATA_PATH': str(self.data),
+            'OBJECT_STORE_PATH': os.path.join(self.tmp.name, 'output'),
+            'LOAD_STRATEGY': 'incremental',
+            'DB_TYPE': 'sqlite',
+            'DB_PATH': self.db_path,
+        }
+        with mock.patch.dict(os.environ, env):
+            self.pipeline = Pipeline()
+            self.pipeline.loader
+
+    def tearDown(self):
+        self.pipeline.close()
+        self.tmp.cleanup()
+
+    def run_csv(self, names):
+        pl.DataFrame({'id': list(range(1, len(names) + 1)), 'color': names}).write_csv(self.data / 'test.csv')
+        self.pipeline.process_csv('test.csv', store_key='csv_data')
+
+    def rows(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT id, color FROM test ORDER BY id").fetchall()
+
+    def test_failed_load_is_caught_up_on_next_run(self):
+        self.run_csv(['red', 'green'])
+        with mock.patch.object(self.pipeline.loader, 'apply_changes', side_effect=ConnectionError('down')):
+            with self.assertRaises(ConnectionError):
+                self.run_csv(['red', 'blue', 'gray'])
+
+        self.run_csv(['red', 'blue'])
+
+        self.assertEqual(self.rows(), [(1, 'red'), (2, 'blue')])
+
+    def test_failed_full_load_forces_full_reload(self):
+        self.run_csv(['red'])
+        self.pipeline.load_strategy = 'full'
+        with mock.patch.object(self.pipeline.loader, 'load_parquet', side_effect=ConnectionError('down')):
+            with self.assertRaises(ConnectionError):
+                self.run_csv(['red', 'green'])
+        self.pipeline.load_strategy = 'incremental'
+
+        self.run_csv(['red', 'green'])
+
+        self.assertEqual(self.rows(), [(1, 'red'), (2, 'green')])
+
+
+if __name__ == '__main__':
+    unittest.main()
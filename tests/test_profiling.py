@@ -0,0 +1,46 @@
+import pstats
+import tempfile
+import time
+import unittest
+from src.utils.profiling import StageProfiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    data = []
+    while time.perf_counter() < end:
+        data.append(str(len(data)))
+    return data
+
+
+class TestStageProfiler(unittest.TestCase):
+    def test_disabled_is_shared_noop(self):
+        profiler = StageProfiler(enabled=False)
+
+        self.assertIs(profiler.stage('extract'), profiler.stage('transform'))
+        with profiler.stage('extract'):
+            pass
+        self.assertIsNone(profiler._run_dir)
+
+    def test_enabled_writes_profile_allocations_and_collapsed_stacks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = StageProfiler(output_dir=tmp, enabled=True)
+            with profiler.stage('transform'):
+                kept = busy(0.1)
+                with profiler.stage('nested'):
+                    pass
+
+            names = sorted(p.name for p in profiler.run_dir.iterdir())
+            self.assertEqual(names, ['01_transform.alloc.txt', '01_transform.collapsed', '01_transform.prof'])
+
+            stats = pstats.Stats(str(profiler.run_dir / '01_transform.prof'))
+            self.assertTrue(any(func[2] == 'busy' for func in stats.stats))
+            collapsed = (profiler.run_dir / '01_transform.collapsed').read_text().splitlines()
+            self.assertTrue(any('busy (test_profiling.py' in line for line in collapsed))
+            self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in collapsed))
+            self.assertIn('Stage transform', (profiler.run_dir / '01_transform.alloc.txt').read_text())
+            self.assertTrue(kept)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+import polars as pl
+from src.storage import ObjectStore
+
+
+class TestObjectStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ObjectStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_single_table_round_trip(self):
+        self.store.save(pl.DataFrame({'id': [1, 2]}), 'csv_data')
+
+        self.assertEqual(self.store.load('csv_data')['id'].to_list(), [1, 2])
+        self.assertTrue((Path(self.tmp.name) / 'csv_data.parquet').exists())
+
+    def test_multi_table_commit_via_manifest(self):
+        self.store.save({'users': pl.DataFrame({'user_id': ['1']}), 'jobs_history': pl.DataFrame({'job_id': ['a']})}, 'json_data')
+
+        located = self.store.locate('json_data')
+        self.assertEqual(set(located), {'users', 'jobs_history'})
+        self.assertTrue(self.store.manifest_path('json_data').exists())
+        # Flat per-table files are still written for existing readers
+        self.assertEqual(pl.read_parquet(Path(self.tmp.name) / 'json_data_users.parquet')['user_id'].to_list(), ['1'])
+
+    def test_failed_write_keeps_previous_file(self):
+        self.store.save(pl.DataFrame({'id': [1]}), 'csv_data')
+
+        with mock.patch.object(pl.DataFrame, 'write_parquet', side_effect=RuntimeError('disk full')):
+            with self.assertRaises(RuntimeError):
+                self.store.save(pl.DataFrame({'id': [2]}), 'csv_data')
+
+        self.assertEqual(self.store.load('csv_data')['id'].to_list(), [1])
+        self.assertEqual([p.name for p in Path(self.tmp.name).iterdir()], ['csv_data.parquet'])
+
+    def test_concurrent_readers_never_see_partial_tables(self):
+        def tables(n):
+            return {'users': pl.DataFrame({'v': [n] * 1000}), 'jobs_history': pl.DataFrame({'v': [n] * 1000})}
+
+        self.store.save(tables(0), 'json_data')
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                try:
+                    data = self.store.load('json_data')
+                    values = {df['v'][0] for df in data.values()}
+                    if len(values) != 1 or any(df.height != 1000 for df in data.values()):
+                        errors.append(values)
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for n in range(1, 20):
+            self.store.save(tables(n), 'json_data')
+        done.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+
+    def test_delete_removes_single_and_multi_table_keys(self):
+        self.store.save(pl.DataFrame({'id': [1]}), 'csv_data')
+        self.store.save({'users': pl.DataFrame({'v': [1]})}, 'json_data')
+        self.store.save(pl.DataFrame({'id': [1]}), 'json_data_extra')
+
+        self.store.delete('csv_data')
+        self.store.delete('json_data')
+
+        self.assertIsNone(self.store.locate('csv_data'))
+        self.assertEqual(sorted(p.name for p in Path(self.tmp.name).iterdir()), ['.generations', 'json_data_extra.parquet'])
+
+    def test_repeated_loads_hit_cache(self):
+        self.store.save(pl.DataFrame({'id': [1, 2]}), 'csv_data')
+
+        first = self.store.load('csv_data')
+        first.insert_column(1, pl.Series('extra', [0, 0]))
+        with mock.patch('src.storage.READERS', {}):
+            second = self.store.load('csv_data')
+
+        self.assertEqual(second.columns, ['id'])
+        self.assertEqual(self.store.cache.hits, 1)
+
+    def test_rewrite_invalidates_cache(self):
+        self.store.save({'users': pl.DataFrame({'v': [1]})}, 'json_data')
+        self.store.load('json_data')
+        self.store.save({'users': pl.DataFrame({'v': [2]})}, 'json_data')
+
+        self.assertEqual(self.store.load('json_data')['users']['v'].to_list(), [2])
+
+    def test_cache_evicts_least_recently_used(self):
+        df = pl.DataFrame({'v': list(range(1000))})
+        store = ObjectStore(self.tmp.name, cache_bytes=int(df.estimated_size() * 2.5))
+        for key in ('a', 'b', 'c'):
+            store.save(df, key)
+        store.load('a')
+        store.load('b')
+        store.load('a')
+        store.load('c')
+
+        self.assertEqual([p.stem for p in store.cache._entries], ['a', 'c'])
+        self.assertLessEqual(store.cache.size, store.cache.max_bytes)
+
+    def test_ipc_round_trip(self):
+        self.store.save(pl.DataFrame({'id': [1, 2], 'name': ['a', 'b']}), 'hot', 'ipc')
+
+        self.assertEqual(self.store.load('hot', 'ipc')['name'].to_list(), ['a', 'b'])
+
+    def test_locate_sees_files_added_by_other_writers(self):
+        self.store.save({'users': pl.DataFrame({'v': [1]})}, 'legacy')
+        self.store.manifest_path('legacy').unlink()
+        self.assertEqual(set(self.store.locate('legacy')), {'users'})
+
+        ObjectStore(self.tmp.name).save(pl.DataFrame({'v': [1]}), 'legacy_jobs')
+
+        self.assertEqual(set(self.store.locate('legacy')), {'users', 'jobs'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
+from unittest import mock
 import polars as pl
+from src.utils import normalize
 from src.transformers import CSVTransformer, JSONTransformer
 
 
@@ -33,6 +35,40 @@ class TestCSVTransformer(unittest.TestCase):
         result = self.transformer.transform(df)
         # Check that all IDs are unique (no duplicates)
         self.assertTrue(result['id'].is_unique().all())
+    
+    def test_string_booleans_use_native_expression(self):
+        df = pl.DataFrame({'is_claimed': ['True', 'fals', None]})
+        
+        self.assertNotIn('python_udf', df.lazy().with_columns(self.transformer.plan(df)).explain())
+        self.assertEqual(self.transformer.transform(df)['is_claimed'].to_list(), [True, False, False])
+        self.assertEqual(
+            self.transformer.transform(pl.DataFrame({'is_claimed': [True, None]}))['is_claimed'].to_list(),
+            [True, False]
+        )
+    
+    def test_fallback_workers_match_in_process_result(self):
+        df = pl.DataFrame({'created_at': ['Jan 5 2020', '2020-01-01', 'not a date'] * 4})
+        transformer = CSVTransformer(workers=2)
+        self.addCleanup(transformer.close)
+        
+        with mock.patch.object(normalize, 'FALLBACK_POOL_ROWS', 4):
+            result = transformer.transform(df)
+        
+        self.assertEqual(result['created_at'].to_list(), self.transformer.transform(df)['created_at'].to_list())
+        transformer.close()
+        self.assertIsNone(transformer.pool._executor)
+    
+    def test_transform_masks_pii(self):
+        df = pl.DataFrame({
+            'name': ['John Smith', None],
+            'address': ['1 Main St\nSpringfield', 'Nowhere']
+        })
+        
+        result = self.transformer.transform(df)
+        
+        self.assertEqual(result.columns, ['name', 'address', 'id'])
+        self.assertEqual(result['name'].to_list(), ['J*** S***', None])
+        self.assertEqual(result['address'].to_list(), ['*********\nSpringfield', '*******'])
 
 
 class TestJSONTransformer(unittest.TestCase):
@@ -0,0 +1,120 @@
+import unittest
+import polars as pl
+from src.transformers import CSVTransformer, JSONTransformer
+from src.validators import CSVValidator, JSONValidator, REASON_COLUMN
+
+
+class TestCSVValidator(unittest.TestCase):
+    def setUp(self):
+        self.transformer = CSVTransformer()
+        self.validator = CSVValidator()
+
+    def test_quarantines_dirty_rows(self):
+        raw = pl.DataFrame({
+            'id': [1, 2, 3, 4],
+            'created_at': ['2020-01-01', 'not a date', '2020-01-03', '2020-01-04'],
+            'is_claimed': ['True', 'False', 'garbage', 'truee'],
+            'paid_amount': ['5004.67', '893.40', '12.00', 'abc']
+        })
+        transformed = self.transformer.transform(raw)
+
+        clean, quarantined, counts = self.validator.validate(transformed, raw)
+
+        self.assertEqual(clean['id'].to_list(), [1])
+        self.assertEqual(quarantined['id'].to_list(), [2, 3, 4])
+        self.assertEqual(quarantined[REASON_COLUMN].to_list(), [
+            'created_at:invalid_timestamp',
+            'is_claimed:invalid_boolean',
+            'paid_amount:invalid_amount',
+        ])
+        self.assertEqual(counts['created_at:invalid_timestamp'], 1)
+        self.assertEqual(counts['is_claimed:invalid_boolean'], 1)
+        self.assertEqual(counts['paid_amount:invalid_amount'], 1)
+        self.assertIn('created_at__raw', quarantined.columns)
+
+    def test_ambiguous_amounts_are_quarantined(self):
+        raw = pl.DataFrame({'id': [1, 2, 3, 4, 5, 6], 'paid_amount': ['12,50', '1,5', '1 2 3', '1_000', '١٢', '5004.67']})
+        transformed = self.transformer.transform(raw)
+
+        clean, quarantined, counts = self.validator.validate(transformed, raw)
+
+        self.assertEqual(clean['paid_amount'].to_list(), [5004.67])
+        self.assertEqual(counts['paid_amount:invalid_amount'], 5)
+
+    def test_currency_amounts_are_opt_in(self):
+        raw = pl.DataFrame({'id': [1, 2], 'paid_amount': ['$1,234.50', '12,50']})
+
+        self.assertEqual(self.transformer.transform(raw)['paid_amount'].to_list(), [None, None])
+        self.assertEqual(CSVTransformer(parse_currency=True).transform(raw)['paid_amount'].to_list(), [1234.5, None])
+
+    def test_missing_values_are_not_quarantined(self):
+        raw = pl.DataFrame({
+            'id': [1, 2],
+            'created_at': ['2020-01-01', None],
+            'paid_amount': [None, '1.00']
+        })
+        transformed = self.transformer.transform(raw)
+
+        clean, quarantined, _ = self.validator.validate(transformed, raw)
+
+        self.assertEqual(clean.height, 2)
+        self.assertTrue(quarantined.is_empty())
+
+    def test_raw_pii_is_not_copied(self):
+        raw = pl.DataFrame({'id': [1], 'name': ['John Doe'], 'paid_amount': ['x']})
+        transformed = self.transformer.transform(raw)
+
+        _, quarantined, _ = self.validator.validate(transformed, raw)
+
+        self.assertEqual(quarantined.height, 1)
+        self.assertNotIn('name__raw', quarantined.columns)
+
+
+class TestJSONValidator(unittest.TestCase):
+    def test_quarantines_per_table(self):
+        data = {
+            'users': pl.DataFrame({'user_id': ['1']}),
+            'jobs_history': pl.DataFrame({'job_id': ['a', None], 'user_id': ['1', '1']})
+        }
+
+        clean, quarantined, counts = JSONValidator().validate(data)
+
+        self.assertEqual(clean['users'].height, 1)
+        self.assertEqual(clean['jobs_history'].height, 1)
+        self.assertEqual(quarantined['jobs_history'].height, 1)
+        self.assertEqual(counts['jobs_history.job_id:missing_value'], 1)
+
+    def test_validates_raw_json_values(self):
+        records = [
+            {
+                'user_id': '1', 'created_at': '2020-01-01', 'updated_at': 'bad date',
+                'user_details': {'telephone_numbers': ['123-456-7890']},
+                'jobs_history': [{'id': 'a', 'start': '2020-01-01'}],
+            },
+            {
+                'user_id': '2', 'created_at': '2020-01-02', 'logged_at': 1577836800,
+                'jobs_history': [
+                    {'id': 'b', 'end': 'whenever', 'is_fulltime': 'maybe'},
+                    {'id': 'c', 'is_fulltime': True},
+                ],
+            },
+        ]
+        tables, raw = JSONTransformer().transform_with_raw(records)
+
+        clean, quarantined, counts = JSONValidator().validate(tables, raw)
+
+        self.assertEqual(clean['users']['user_id'].to_list(), ['2'])
+        self.assertEqual(quarantined['users']['updated_at__raw'].to_list(), ['bad date'])
+        self.assertEqual(counts['users.updated_at:invalid_timestamp'], 1)
+        self.assertEqual(quarantined['jobs_history'].sort('job_id')[REASON_COLUMN].to_list(), [
+            'user_id:quarantined_user',
+            'end:invalid_date;is_fulltime:invalid_boolean',
+        ])
+        self.assertEqual(clean['jobs_history']['job_id'].to_list(), ['c'])
+        # Phones of the quarantined user follow it, keeping the foreign key loadable
+        self.assertTrue(clean['telephone_numbers'].is_empty())
+        self.assertEqual(list(clean), ['users', 'telephone_numbers', 'jobs_history'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import os
+import signal
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from src.worker import Worker, _host
+
+
+class FakePipeline:
+    def __init__(self, on_process=None):
+        self.calls = []
+        self.on_process = on_process
+        self.closed = False
+
+    def process_csv(self, filename, load=True, store_key=None):
+        self.calls.append(('csv', filename, load, store_key))
+        if self.on_process:
+            self.on_process()
+
+    def process_json(self, filename, load=True, store_key=None):
+        self.calls.append(('json', filename, load, store_key))
+        if self.on_process:
+            self.on_process()
+
+    def close(self):
+        self.closed = True
+
+
+class TestWorker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.spool = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_job(self, name, job):
+        (self.spool / name).write_text(json.dumps(job))
+
+    def test_processes_jobs_with_reused_pipeline(self):
+        pipeline = FakePipeline()
+        worker = Worker(self.spool, pipeline=pipeline)
+        self.write_job('1.json', {'mode': 'csv', 'file': 'a.csv', 'store_key': 'a'})
+        self.write_job('2.json', {'mode': 'json', 'file': 'b.json', 'store_key': 'b', 'store_only': True})
+
+        self.assertEqual(worker.run_once(), 2)
+
+        self.assertEqual(pipeline.calls, [('csv', 'a.csv', True, 'a'), ('json', 'b.json', False, 'b')])
+        result = json.loads((self.spool / 'done' / '1.json').read_text())
+        self.assertEqual(result['status'], 'done')
+        self.assertIn('latency_ms', result)
+        self.assertEqual(list(self.spool.glob('*.json')), [])
+
+    def test_invalid_job_is_moved_to_failed(self):
+        worker = Worker(self.spool, pipeline=FakePipeline())
+        self.write_job('bad.json', {'mode': 'xml', 'file': 'a', 'store_key': 'a'})
+
+        worker.run_once()
+
+        result = json.loads((self.spool / 'failed' / 'bad.json').read_text())
+        self.assertEqual(result['status'], 'failed')
+        self.assertIn('Invalid job mode', result['error'])
+
+    def test_stop_finishes_current_job_only(self):
+        worker = Worker(self.spool, pipeline=FakePipeline())
+        worker._pipeline.on_process = worker.stop
+        self.write_job('1.json', {'mode': 'csv', 'file': 'a.csv', 'store_key': 'a'})
+        self.write_job('2.json', {'mode': 'csv', 'file': 'b.csv', 'store_key': 'b'})
+
+        worker.run()
+
+        self.assertEqual(len(worker.pipeline.calls), 1)
+        self.assertTrue(worker.pipeline.closed)
+        self.assertTrue((self.spool / '2.json').exists())
+
+    def test_run_restores_signal_handlers(self):
+        worker = Worker(self.spool, pipeline=FakePipeline())
+        worker.stop()
+        before = signal.getsignal(signal.SIGINT)
+
+        worker.run()
+
+        self.assertIs(signal.getsignal(signal.SIGINT), before)
+
+    def test_requeues_claims_of_dead_and_stale_workers(self):
+        job = json.dumps({'mode': 'csv', 'file': 'a.csv', 'store_key': 'a'})
+        # A pid that cannot exist on this host
+        (self.spool / f"1.{_host()}-{2 ** 22 + 1}.processing").write_text(job)
+        (self.spool / '2.otherhost-1.processing').write_text(job)
+        old = (self.spool / '3.otherhost-1.processing')
+        old.write_text(job)
+        os.utime(old, (time.time() - 7200, time.time() - 7200))
+        pipeline = FakePipeline()
+
+        Worker(self.spool, pipeline=pipeline).run_once()
+
+        self.assertEqual(len(pipeline.calls), 2)
+        self.assertTrue((self.spool / '2.otherhost-1.processing').exists())
+        self.assertEqual(sorted(p.name for p in (self.spool / 'done').iterdir()), ['1.json', '3.json'])
+
+    def test_reused_job_name_keeps_earlier_result(self):
+        worker = Worker(self.spool, pipeline=FakePipeline())
+        for store_key in ('a', 'b'):
+            self.write_job('1.json', {'mode': 'csv', 'file': 'a.csv', 'store_key': store_key})
+            worker.run_once()
+
+        results = [json.loads(p.read_text()) for p in (self.spool / 'done').iterdir()]
+        self.assertEqual(sorted(r['job']['store_key'] for r in results), ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()